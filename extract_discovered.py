@@ -1,88 +1,140 @@
 #!/usr/bin/env python3
 """Extract discovered devices from metrics and generate config entries."""
 
+import os
 import re
 import sys
-from urllib.request import urlopen
+
+import httpx
 
 METRICS_URL = "http://localhost:10037/metrics"
 CONFIG_FILE = "/apps/shelly_exporter/config/config.yml"
 
-
-def parse_metrics():
-    """Parse discovered devices from metrics endpoint."""
+_PREFIX = b"shelly_discovered_device_info{"
+_PREFIX_LEN = len(_PREFIX)
+_KV_RE = re.compile(rb'(\w+)="([^"]*)"')
+# Label columns collected per device, with the bytes label key and the default value
+_COLUMNS: dict[str, tuple[bytes, str]] = {
+    "ip": (b"ip", ""),
+    "app": (b"app", "unknown"),
+    "gen": (b"gen", "0"),
+    "model": (b"model", "unknown"),
+    "mac": (b"mac", ""),
+    "discovered_at": (b"discovered_at", ""),
+}
+_URL_RE = re.compile(rb"^\s*-?\s*url:\s*([^\s#]+)", re.MULTILINE)
+
+# Parsed config hosts keyed by path, validated against (st_mtime_ns, st_size)
+_ip_cache: dict[str, tuple[int, int, frozenset[str]]] = {}
+
+# YAML output templates, one format call per entry/channel
+_HEADER = "# Discovered devices (extracted from metrics)\n\n"
+_ENTRY_TMPL = "  - name: {name}\n    url: {url}\n    discovered: true\n"
+_CH_HDR = "    channels:\n"
+_CH_TMPL = "    - type: {type}\n      index: {index}\n"
+_EMPTY_CH = "    channels: []\n"
+
+
+def _iter_lines(response: httpx.Response):
+    """Yield the response body line by line as bytes, one chunk in memory at a time."""
+    pending = b""
+    for chunk in response.iter_bytes():
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _new_client() -> httpx.Client:
+    """Create the keep-alive client for scraping, so repeated scrapes reuse one connection."""
+    return httpx.Client(
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=4),
+    )
+
+
+def parse_metrics(client: httpx.Client) -> dict[str, list[str]]:
+    """Parse discovered devices from metrics endpoint.
+
+    Args:
+        client: HTTP client used to fetch METRICS_URL
+
+    Returns:
+        One list per label (see _COLUMNS); row i across all lists is device i
+    """
+    devices: dict[str, list[str]] = {column: [] for column in _COLUMNS}
+    columns = [(devices[column], key, default) for column, (key, default) in _COLUMNS.items()]
     try:
-        with urlopen(METRICS_URL) as f:
-            metrics = f.read().decode("utf-8")
+        with client.stream("GET", METRICS_URL) as response:
+            response.raise_for_status()
+            for line in _iter_lines(response):
+                if not line.startswith(_PREFIX):
+                    continue
+
+                # Labels: app="Pro4PM",discovered_at="...",gen="2",ip="10.0.80.53",mac="...",model="..."
+                end = line.find(b"}", _PREFIX_LEN)
+                if end < 0:
+                    continue
+                labels = dict(_KV_RE.findall(line, _PREFIX_LEN, end))
+                for values, key, default in columns:
+                    value = labels.get(key)
+                    values.append(default if value is None else value.decode("utf-8"))
     except Exception as e:
         print(f"Error fetching metrics: {e}", file=sys.stderr)
         sys.exit(1)
 
-    devices = []
-    for line in metrics.split("\n"):
-        if not line.startswith("shelly_discovered_device_info{"):
-            continue
-
-        # Extract labels: app="Pro4PM",discovered_at="...",gen="2",ip="10.0.80.53",mac="...",model="..."
-        match = re.search(r"\{([^}]+)\}", line)
-        if not match:
-            continue
-
-        labels = {}
-        for part in match.group(1).split(","):
-            key, value = part.split("=", 1)
-            labels[key] = value.strip('"')
+    return devices
 
-        devices.append(labels)
 
-    return devices
+def _url_to_host(url: bytes) -> str:
+    """Reduce a config url value (optionally quoted, with scheme/port/path) to its host."""
+    host = url.strip(b"'\"")
+    if b"://" in host:
+        host = host.split(b"://", 1)[1]
+    host = host.split(b"/", 1)[0].split(b":", 1)[0]
+    return sys.intern(host.decode("utf-8"))
 
 
 def get_existing_ips():
     """Get IPs already in config file."""
     try:
-        with open(CONFIG_FILE) as f:
+        st = os.stat(CONFIG_FILE)
+        cached = _ip_cache.get(CONFIG_FILE)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+        with open(CONFIG_FILE, "rb") as f:
             content = f.read()
     except Exception as e:
         print(f"Error reading config: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Extract URLs from config
-    ips = set()
-    for match in re.finditer(r'url:\s*([0-9.]+)', content):
-        ips.add(match.group(1))
-
+    # Extract URL hosts from config
+    ips = frozenset(_url_to_host(m.group(1)) for m in _URL_RE.finditer(content))
+    _ip_cache[CONFIG_FILE] = (st.st_mtime_ns, st.st_size, ips)
     return ips
 
 
-def get_channels_for_device(app: str, gen: int) -> list[dict]:
-    """Get channel configuration based on device type."""
+# Channel layout per (gen, app); devices not listed (gateways, etc.) get no channels
+_CHANNELS: dict[tuple[int, str], tuple[dict, ...]] = {
     # Pro2PM Gen2: 2 switch channels
-    if gen == 2 and app == "Pro2PM":
-        return [
-            {"type": "switch", "index": 0},
-            {"type": "switch", "index": 1},
-        ]
-
+    (2, "Pro2PM"): tuple({"type": "switch", "index": i} for i in range(2)),
     # Pro4PM Gen2: 4 switch channels
-    if gen == 2 and app == "Pro4PM":
-        return [
-            {"type": "switch", "index": 0},
-            {"type": "switch", "index": 1},
-            {"type": "switch", "index": 2},
-            {"type": "switch", "index": 3},
-        ]
-
+    (2, "Pro4PM"): tuple({"type": "switch", "index": i} for i in range(4)),
     # PlusWallDimmer Gen2: 1 light channel
-    if gen == 2 and app == "PlusWallDimmer":
-        return [{"type": "light", "index": 0}]
-
+    (2, "PlusWallDimmer"): ({"type": "light", "index": 0},),
     # Plus10V Gen2: likely 1 light channel (similar to PlusWallDimmer)
-    if gen == 2 and app == "Plus10V":
-        return [{"type": "light", "index": 0}]
+    (2, "Plus10V"): ({"type": "light", "index": 0},),
+}
+
 
-    # Default: empty channels (gateway devices, etc.)
-    return []
+def get_channels_for_device(app: str, gen: int) -> list[dict]:
+    """Get channel configuration based on device type.
+
+    Returns fresh dicts, so callers may modify them without touching _CHANNELS.
+    """
+    return [dict(channel) for channel in _CHANNELS.get((gen, app), ())]
 
 
 def generate_name(ip: str, model: str, mac: str) -> str:
@@ -94,59 +146,74 @@ def generate_name(ip: str, model: str, mac: str) -> str:
     return f"shelly_{ip_clean}_{mac_short}_{model_clean}"
 
 
-def generate_yaml(devices: list[dict], existing_ips: set[str]) -> str:
-    """Generate YAML config entries for discovered devices."""
+def build_entries(
+    devices: dict[str, list[str]], existing_ips: frozenset[str] | set[str]
+) -> list[dict]:
+    """Build target entries for discovered devices not already in the config.
+
+    Each entry is shaped like a config target, so in-process callers can pass it
+    straight to TargetConfig.model_validate without going through YAML.
+
+    Args:
+        devices: Label columns as returned by parse_metrics
+        existing_ips: Hosts already present in the config file
+
+    Returns:
+        List of target dicts (name, url, discovered, channels)
+    """
     entries = []
-    missing = []
+    ips, apps, gens = devices["ip"], devices["app"], devices["gen"]
+    models, macs = devices["model"], devices["mac"]
 
-    for device in devices:
-        ip = device.get("ip", "")
+    for i in range(len(ips)):
+        ip = ips[i]
         if not ip or ip in existing_ips:
             continue
 
-        app = device.get("app", "unknown")
-        gen = int(device.get("gen", "0"))
-        model = device.get("model", "unknown")
-        mac = device.get("mac", "")
-
-        channels = get_channels_for_device(app, gen)
-        name = generate_name(ip, model, mac)
+        entries.append(
+            {
+                "name": generate_name(ip, models[i], macs[i]),
+                "url": ip,
+                "discovered": True,
+                "channels": get_channels_for_device(apps[i], int(gens[i])),
+            }
+        )
 
-        entry = {
-            "name": name,
-            "url": ip,
-            "discovered": True,
-            "channels": channels,
-        }
+    return entries
 
-        entries.append(entry)
-        missing.append(ip)
 
+def entries_to_yaml(entries: list[dict]) -> str:
+    """Render target entries from build_entries as YAML for the CLI output."""
     if not entries:
         return "# No new discovered devices to add (all already in config)\n"
 
-    yaml_lines = ["# Discovered devices (extracted from metrics)", ""]
-    for entry in entries:
-        yaml_lines.append(f"  - name: {entry['name']}")
-        yaml_lines.append(f"    url: {entry['url']}")
-        yaml_lines.append(f"    discovered: true")
+    parts = [_HEADER]
+    for i, entry in enumerate(entries):
+        if i:
+            parts.append("\n")
+        parts.append(_ENTRY_TMPL.format(**entry))
         if entry["channels"]:
-            yaml_lines.append("    channels:")
-            for ch in entry["channels"]:
-                yaml_lines.append(f"    - type: {ch['type']}")
-                yaml_lines.append(f"      index: {ch['index']}")
+            parts.append(_CH_HDR)
+            parts.extend(_CH_TMPL.format(**ch) for ch in entry["channels"])
         else:
-            yaml_lines.append("    channels: []")
-        yaml_lines.append("")
+            parts.append(_EMPTY_CH)
+
+    return "".join(parts)
+
 
-    return "\n".join(yaml_lines)
+def generate_yaml(
+    devices: dict[str, list[str]], existing_ips: frozenset[str] | set[str]
+) -> str:
+    """Generate YAML config entries for discovered devices (columns from parse_metrics)."""
+    return entries_to_yaml(build_entries(devices, existing_ips))
 
 
 def main():
     """Main entry point."""
     print("Fetching discovered devices from metrics...", file=sys.stderr)
-    devices = parse_metrics()
-    print(f"Found {len(devices)} discovered devices in metrics", file=sys.stderr)
+    with _new_client() as client:
+        devices = parse_metrics(client)
+    print(f"Found {len(devices['ip'])} discovered devices in metrics", file=sys.stderr)
 
     print("Reading existing config...", file=sys.stderr)
     existing_ips = get_existing_ips()
@@ -2,14 +2,42 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
+import sys
+import tempfile
+from collections import OrderedDict
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    ValidationError,
+    field_validator,
+    model_validator,
+)
+
+from shelly_exporter import __version__
+
+try:
+    # libyaml-backed parser, an order of magnitude faster than the pure-Python one
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Parsed config data keyed by resolved path, validated against the content hash
+_CONFIG_CACHE_MAX_ENTRIES = 100
+_config_cache: OrderedDict[str, tuple[str, dict[str, Any]]] = OrderedDict()
 
 
 class LogLevel(str, Enum):
@@ -30,7 +58,12 @@ class Credentials(BaseModel):
 
 
 class ChannelConfig(BaseModel):
-    """Configuration for a single channel (switch or light)."""
+    """Configuration for a single channel (switch or light).
+
+    Instances are immutable so identical channel configs can be shared.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     type: str = "switch"
     index: int = 0
@@ -46,6 +79,9 @@ class ChannelConfig(BaseModel):
     ignore_output: bool = False
     ignore_brightness: bool = False
 
+    # Interned str(index), used as the metric label value
+    _index_str: str = PrivateAttr(default="0")
+
     @field_validator("index", mode="before")
     @classmethod
     def normalize_index(cls, v: int) -> int:
@@ -56,9 +92,38 @@ class ChannelConfig(BaseModel):
             pass
         return v
 
+    @model_validator(mode="after")
+    def intern_index_str(self) -> ChannelConfig:
+        """Precompute the interned label string for the channel index."""
+        self._index_str = sys.intern(str(self.index))
+        return self
+
+    @classmethod
+    def build(cls, **kwargs: Any) -> ChannelConfig:
+        """Return a shared (interned) instance for the given field values."""
+        try:
+            key = frozenset((k, type(v), v) for k, v in kwargs.items())
+            return _build_channel_config(cls, key)
+        except TypeError:
+            # Unhashable values; construct normally and let validation report them
+            return cls(**kwargs)
+
+
+@lru_cache(maxsize=4096)
+def _build_channel_config(
+    cls: type[ChannelConfig], key: frozenset[tuple[str, type, Any]]
+) -> ChannelConfig:
+    return cls(**{k: v for k, _, v in key})
+
 
 class TargetConfig(BaseModel):
-    """Configuration for a single Shelly device target."""
+    """Configuration for a single Shelly device target.
+
+    Instances are immutable; a config reload replaces targets rather than
+    editing them, so derived data can be cached per instance.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     name: str
     url: str
@@ -67,19 +132,30 @@ class TargetConfig(BaseModel):
     channels: list[ChannelConfig] = Field(default_factory=list)
     discovered: bool = False  # True if this target was auto-discovered
 
+    # Effective settings resolved by the owning Config at load time
+    _effective_credentials: Credentials | None = PrivateAttr(default=None)
+    _effective_poll_interval: int = PrivateAttr(default=0)
+    _resolved_from: tuple[Credentials, int] | None = PrivateAttr(default=None)
+    # (type, index) -> first matching channel, built once after validation
+    _channel_index: dict[tuple[str, int], ChannelConfig] = PrivateAttr(default_factory=dict)
+
     @model_validator(mode="before")
     @classmethod
     def handle_legacy_target_meters(cls, data: dict[str, Any]) -> dict[str, Any]:
-        """Handle backward compatibility with target_meters key."""
+        """Handle backward compatibility with target_meters key.
+
+        Builds a new dict rather than mutating the input, so parsed config data
+        can be validated repeatedly without copying it first.
+        """
         if isinstance(data, dict) and "target_meters" in data:
+            data = dict(data)
             meters = data.pop("target_meters")
-            channels = data.get("channels", [])
+            channels = list(data.get("channels", []))
             for meter in meters:
                 if isinstance(meter, int):
                     channels.append({"type": "switch", "index": meter})
                 elif isinstance(meter, dict):
-                    meter.setdefault("type", "switch")
-                    channels.append(meter)
+                    channels.append({"type": "switch", **meter})
             data["channels"] = channels
             logging.warning(
                 f"Target '{data.get('name', 'unknown')}' uses deprecated 'target_meters'. "
@@ -87,6 +163,41 @@ class TargetConfig(BaseModel):
             )
         return data
 
+    @field_validator("name")
+    @classmethod
+    def intern_name(cls, v: str) -> str:
+        """Intern the target name, which is reused as the device label on every poll."""
+        return sys.intern(v)
+
+    @field_validator("channels", mode="before")
+    @classmethod
+    def intern_channels(cls, v: Any) -> Any:
+        """Share one ChannelConfig instance between identical channel entries."""
+        if not isinstance(v, list):
+            return v
+        channels = []
+        for ch in v:
+            if isinstance(ch, dict):
+                try:
+                    ch = ChannelConfig.build(**ch)
+                except (TypeError, ValidationError):
+                    pass  # Leave as-is so the error is reported against this target
+            channels.append(ch)
+        return channels
+
+    @model_validator(mode="after")
+    def index_channels(self) -> TargetConfig:
+        """Index channels by (type, index) for per-reading lookups."""
+        index: dict[tuple[str, int], ChannelConfig] = {}
+        for ch in self.channels:
+            index.setdefault((ch.type, ch.index), ch)
+        self._channel_index = index
+        return self
+
+    def get_channel(self, channel_type: str, channel_index: int) -> ChannelConfig | None:
+        """Find channel config matching type and index."""
+        return self._channel_index.get((channel_type, channel_index))
+
 
 class DiscoveryConfig(BaseModel):
     """Configuration for network scanning and auto-discovery."""
@@ -95,6 +206,7 @@ class DiscoveryConfig(BaseModel):
     scan_interval_seconds: int = 3600  # 1 hour
     network_ranges: list[str] = Field(default_factory=list)
     scan_timeout_seconds: float = 2.0
+    tcp_probe_timeout: float = 0.2  # TCP connect pre-check before each probe; 0 disables it
     scan_concurrency: int = 20
     auto_add_discovered: bool = True
     auto_add_credentials: Credentials | None = None
@@ -124,16 +236,50 @@ class Config(BaseModel):
     backoff_max_seconds: float = 300.0  # 5 minutes
     backoff_multiplier: float = 2.0
 
-    def get_target_credentials(self, target: TargetConfig) -> Credentials | None:
-        """Get effective credentials for a target (target > default > none)."""
+    @model_validator(mode="after")
+    def resolve_target_settings(self) -> Config:
+        """Resolve effective credentials and poll interval for each target once.
+
+        The poll loop reads these on every cycle, so they are cached on the
+        targets here instead of being recomputed per call.
+        """
+        for target in self.targets:
+            target._effective_credentials = self._resolve_credentials(target)
+            target._effective_poll_interval = (
+                target.poll_interval_seconds or self.poll_interval_seconds
+            )
+            target._resolved_from = (
+                self.default_credentials,
+                self.poll_interval_seconds,
+            )
+        return self
+
+    def _resolve_credentials(self, target: TargetConfig) -> Credentials | None:
         if target.credentials and target.credentials.has_credentials():
             return target.credentials
         if self.default_credentials.has_credentials():
             return self.default_credentials
         return None
 
+    def _is_resolved(self, target: TargetConfig) -> bool:
+        resolved_from = target._resolved_from
+        return (
+            resolved_from is not None
+            and resolved_from[0] is self.default_credentials
+            and resolved_from[1] == self.poll_interval_seconds
+        )
+
+    def get_target_credentials(self, target: TargetConfig) -> Credentials | None:
+        """Get effective credentials for a target (target > default > none)."""
+        if self._is_resolved(target):
+            return target._effective_credentials
+        # Targets not resolved by this config (e.g. added at runtime by discovery)
+        return self._resolve_credentials(target)
+
     def get_target_poll_interval(self, target: TargetConfig) -> int:
         """Get effective poll interval for a target."""
+        if self._is_resolved(target):
+            return target._effective_poll_interval
         return target.poll_interval_seconds or self.poll_interval_seconds
 
     def get_discovery_credentials(self) -> Credentials | None:
@@ -163,7 +309,113 @@ def load_config(config_path: str | Path | None = None) -> Config:
     if not path.exists():
         raise FileNotFoundError(f"Configuration file not found: {path}")
 
-    with open(path) as f:
-        data = yaml.safe_load(f)
+    key = str(path.resolve())
+    raw = path.read_bytes()
+    content_hash = hashlib.blake2b(raw + __version__.encode()).hexdigest()
+
+    # Fast path: contents unchanged since the last parse. Compared by hash, not stat,
+    # since an in-place edit can keep both size and mtime on coarse-mtime filesystems.
+    cached = _config_cache.get(key)
+    if cached is not None and cached[0] == content_hash:
+        _config_cache.move_to_end(key)
+        return Config.model_validate(cached[1])
+
+    data = _read_config_sidecar(path, content_hash)
+    if data is not None:
+        config = Config.model_validate(data)
+    else:
+        data = yaml.load(raw, Loader=_SafeLoader) or {}
+        config = Config.model_validate(data)
+        _write_config_sidecar(path, content_hash, config)
+
+    _config_cache[key] = (content_hash, data)
+    _config_cache.move_to_end(key)
+    while len(_config_cache) > _CONFIG_CACHE_MAX_ENTRIES:
+        _config_cache.popitem(last=False)
+
+    return config
+
+
+# Validated configs are cached as JSON only when this names a directory (opt-in)
+_SIDECAR_DIR_ENV = "CONFIG_CACHE_DIR"
+_SIDECAR_SUFFIX = ".cache.json"
+
+
+def _sidecar_path(path: Path) -> Path | None:
+    """Return the JSON cache path for a config file, or None if caching is off.
+
+    The name includes a hash of the resolved config path, so several configs
+    can share one cache directory.
+    """
+    cache_dir = os.environ.get(_SIDECAR_DIR_ENV)
+    if not cache_dir:
+        return None
+    path_hash = hashlib.blake2b(str(path.resolve()).encode(), digest_size=8).hexdigest()
+    return Path(cache_dir) / f"{path.name}.{path_hash}{_SIDECAR_SUFFIX}"
+
+
+def _has_credentials(config: Config) -> bool:
+    """Return True if the config holds any device credentials."""
+    if config.default_credentials.has_credentials():
+        return True
+    auto_add = config.discovery.auto_add_credentials
+    if auto_add is not None and auto_add.has_credentials():
+        return True
+    return any(
+        t.credentials is not None and t.credentials.has_credentials() for t in config.targets
+    )
 
-    return Config.model_validate(data or {})
+
+def _read_config_sidecar(path: Path, content_hash: str) -> dict[str, Any] | None:
+    """Load the JSON sidecar if it was written for the current config contents.
+
+    The first line holds {"__hash__": ...}; the rest is the validated config.
+    Returns None when caching is off or the sidecar is missing, stale, or unreadable.
+    """
+    sidecar = _sidecar_path(path)
+    if sidecar is None:
+        return None
+    try:
+        with open(sidecar, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("__hash__") != content_hash:
+                return None
+            data = json.loads(f.read())
+    except (OSError, ValueError, AttributeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_config_sidecar(path: Path, content_hash: str, config: Config) -> None:
+    """Atomically write the validated config as a JSON sidecar in the cache directory.
+
+    Only explicitly set values are stored so defaults still come from the code.
+    Configs holding credentials are never written, so passwords stay out of the
+    cache. Skipped when caching is off or the cache directory is not writable.
+    """
+    sidecar = _sidecar_path(path)
+    if sidecar is None:
+        return
+    if _has_credentials(config):
+        logger.debug("Not caching config %s: it contains credentials", path)
+        return
+
+    payload = (
+        json.dumps({"__hash__": content_hash}).encode()
+        + b"\n"
+        + config.model_dump_json(exclude_unset=True).encode()
+    )
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=sidecar.parent, prefix=f".{sidecar.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_name, sidecar)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError as e:
+        logger.debug("Could not write config cache for %s: %s", path, e)
@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import os
+import sys
+import time
 from pathlib import Path
 from typing import Any, Callable
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
+try:
+    # Optional: lets the watcher read inotify events straight from the event loop
+    from inotify_simple import INotify
+    from inotify_simple import flags as inotify_flags
+except ImportError:  # pragma: no cover - optional dependency
+    INotify = None
+
 from shelly_exporter.config import Config, load_config
 from shelly_exporter.metrics import (
     update_config_reload_error,
@@ -37,9 +48,12 @@ class ConfigFileHandler(FileSystemEventHandler):
         """
         self.config_path = config_path
         self.config_filename = config_path.name
+        # Events carry full paths; matching on "/<name>" avoids building a Path per event
+        self._filename_suffix = os.sep + config_path.name
         self.callback = callback
         self.debounce_seconds = debounce_seconds
         self._pending_reload: asyncio.TimerHandle | None = None
+        self._deadline: float | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
 
     def set_loop(self, loop: asyncio.AbstractEventLoop) -> None:
@@ -51,12 +65,12 @@ class ConfigFileHandler(FileSystemEventHandler):
         if event.is_directory:
             return
 
-        # Check if this is our config file
-        event_path = Path(event.src_path)
-        if event_path.name != self.config_filename:
+        # Check if this is our config file; src_path may be bytes
+        src_path = os.fsdecode(event.src_path)
+        if not src_path.endswith(self._filename_suffix):
             return
 
-        logger.debug(f"Config file modified: {event.src_path}")
+        logger.debug(f"Config file modified: {src_path}")
         self._schedule_reload()
 
     def on_created(self, event: FileSystemEvent) -> None:
@@ -64,28 +78,53 @@ class ConfigFileHandler(FileSystemEventHandler):
         if event.is_directory:
             return
 
-        event_path = Path(event.src_path)
-        if event_path.name != self.config_filename:
+        src_path = os.fsdecode(event.src_path)
+        if not src_path.endswith(self._filename_suffix):
             return
 
-        logger.debug(f"Config file created: {event.src_path}")
+        logger.debug(f"Config file created: {src_path}")
         self._schedule_reload()
 
     def _schedule_reload(self) -> None:
-        """Schedule a debounced reload."""
+        """Schedule a debounced reload from the watchdog observer thread.
+
+        The debounce state is only touched on the event loop thread, so the
+        work is handed to the loop with call_soon_threadsafe.
+        """
         if self._loop is None:
             logger.warning("Event loop not set, cannot schedule reload")
             return
 
-        # Cancel any pending reload
-        if self._pending_reload is not None:
-            self._pending_reload.cancel()
+        self._loop.call_soon_threadsafe(self._arm_reload)
 
-        # Schedule new reload after debounce period
-        self._pending_reload = self._loop.call_later(
-            self.debounce_seconds,
-            self._trigger_reload,
-        )
+    def _arm_reload(self) -> None:
+        """Push the debounce deadline forward, arming the timer if needed.
+
+        Must run on the event loop thread. Each event only pushes the deadline
+        forward; a single timer is armed and re-armed for the remaining time
+        when it fires early.
+        """
+        if self._loop is None:
+            return
+
+        self._deadline = time.monotonic() + self.debounce_seconds
+
+        if self._pending_reload is None:
+            self._pending_reload = self._loop.call_later(
+                self.debounce_seconds,
+                self._maybe_fire,
+            )
+
+    def _maybe_fire(self) -> None:
+        """Fire the reload once the debounce deadline has passed."""
+        if self._deadline is not None and self._loop is not None:
+            remaining = self._deadline - time.monotonic()
+            if remaining > 0:
+                self._pending_reload = self._loop.call_later(remaining, self._maybe_fire)
+                return
+
+        self._deadline = None
+        self._trigger_reload()
 
     def _trigger_reload(self) -> None:
         """Trigger the actual reload callback."""
@@ -119,31 +158,54 @@ class ConfigWatcher:
 
         self._current_config: Config | None = None
         self._observer: Observer | None = None
+        self._inotify: Any | None = None
         self._handler: ConfigFileHandler | None = None
         self._running = False
-        self._reload_queue: asyncio.Queue[bool] = asyncio.Queue()
+        self._last_content_hash: bytes | None = None
+        self._reload_task: asyncio.Task[None] | None = None
+        self._reload_again = False
 
     @property
     def current_config(self) -> Config | None:
         """Return the currently loaded configuration."""
         return self._current_config
 
+    def _content_hash(self) -> bytes:
+        """Return a short digest of the config file contents."""
+        return hashlib.blake2b(self.config_path.read_bytes(), digest_size=8).digest()
+
     def _on_file_changed(self) -> None:
-        """Callback when file change is detected (after debounce)."""
-        # Put a reload request in the queue
-        try:
-            self._reload_queue.put_nowait(True)
-        except asyncio.QueueFull:
-            logger.warning("Reload queue full, skipping reload request")
+        """Callback when file change is detected (after debounce).
+
+        Runs on the event loop. Starts a reload task, or marks the running one
+        to go again so a change made mid-reload is not lost.
+        """
+        if not self._running:
+            return
+
+        if self._reload_task is not None and not self._reload_task.done():
+            self._reload_again = True
+            return
+
+        self._reload_task = asyncio.create_task(self._run_reloads())
+
+    async def _run_reloads(self) -> None:
+        """Reload until no further change arrived during the last reload."""
+        while True:
+            self._reload_again = False
+            await self._reload_config()
+            if not self._reload_again:
+                break
 
-    async def _reload_config(self) -> bool:
+    async def _reload_config(self, force: bool = False) -> bool:
         """Attempt to reload the configuration.
 
+        Args:
+            force: Reload and notify even if the file looks unchanged
+
         Returns:
             True if reload was successful, False otherwise
         """
-        logger.info(f"Reloading configuration from {self.config_path}")
-
         try:
             # Check if file exists
             if not self.config_path.exists():
@@ -153,6 +215,16 @@ class ConfigWatcher:
                 update_config_reload_error()
                 return False
 
+            # Skip the reload entirely if the file contents did not change. The file is
+            # always hashed: an in-place edit can keep both size and mtime (coarse mtime
+            # on bind mounts, NFS and many Docker volumes), so stat cannot rule one out.
+            content_hash = self._content_hash()
+            if not force and content_hash == self._last_content_hash:
+                logger.debug(f"Config file {self.config_path} unchanged, skipping reload")
+                return True
+
+            logger.info(f"Reloading configuration from {self.config_path}")
+
             # Load and validate new config
             new_config = load_config(self.config_path)
 
@@ -176,6 +248,8 @@ class ConfigWatcher:
                     update_config_reload_error()
                     return False
 
+            self._last_content_hash = content_hash
+
             # Log what changed
             self._log_config_changes(old_config, new_config)
 
@@ -223,6 +297,7 @@ class ConfigWatcher:
 
         # Load initial config
         try:
+            self._last_content_hash = self._content_hash()
             self._current_config = load_config(self.config_path)
             logger.info(
                 f"Loaded initial config with {len(self._current_config.targets)} targets"
@@ -237,55 +312,75 @@ class ConfigWatcher:
             self._on_file_changed,
             self.debounce_seconds,
         )
-        self._handler.set_loop(asyncio.get_running_loop())
-
-        self._observer = Observer()
-        self._observer.schedule(
-            self._handler,
-            str(self.config_path.parent),
-            recursive=False,
-        )
-        self._observer.start()
+        loop = asyncio.get_running_loop()
+        self._handler.set_loop(loop)
+
+        if sys.platform == "linux" and INotify is not None:
+            # Native inotify: events are drained on the loop, no observer thread
+            self._inotify = INotify()
+            self._inotify.add_watch(
+                str(self.config_path.parent),
+                inotify_flags.MODIFY | inotify_flags.CREATE | inotify_flags.MOVED_TO,
+            )
+            loop.add_reader(self._inotify.fileno(), self._drain_inotify)
+        else:
+            self._observer = Observer()
+            self._observer.schedule(
+                self._handler,
+                str(self.config_path.parent),
+                recursive=False,
+            )
+            self._observer.start()
 
         self._running = True
         logger.info(f"Started watching config file: {self.config_path}")
 
-        # Start reload processing loop
-        asyncio.create_task(self._process_reload_queue())
+    def _drain_inotify(self) -> None:
+        """Read all pending inotify events and schedule a reload for our file."""
+        if self._inotify is None or self._handler is None:
+            return
+
+        matched = False
+        for event in self._inotify.read(timeout=0):
+            if event.name == self._handler.config_filename:
+                matched = True
+
+        if matched:
+            logger.debug(f"Config file changed: {self.config_path}")
+            self._handler._arm_reload()
 
     async def stop(self) -> None:
         """Stop watching the configuration file."""
         self._running = False
 
+        if self._inotify is not None:
+            asyncio.get_running_loop().remove_reader(self._inotify.fileno())
+            self._inotify.close()
+            self._inotify = None
+
         if self._observer is not None:
             self._observer.stop()
             self._observer.join(timeout=5.0)
             self._observer = None
 
-        self._handler = None
-        logger.info("Stopped config file watcher")
-
-    async def _process_reload_queue(self) -> None:
-        """Process reload requests from the queue."""
-        while self._running:
+        if self._reload_task is not None:
+            self._reload_task.cancel()
             try:
-                # Wait for reload request with timeout
-                await asyncio.wait_for(
-                    self._reload_queue.get(),
-                    timeout=1.0,
-                )
-                await self._reload_config()
-            except asyncio.TimeoutError:
-                continue
+                await self._reload_task
             except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error processing reload queue: {e}")
+                pass
+            self._reload_task = None
+
+        self._handler = None
+        logger.info("Stopped config file watcher")
 
     async def force_reload(self) -> bool:
         """Force an immediate config reload.
 
+        Unlike reloads triggered by file events, this reloads and notifies
+        on_reload even when the file is unchanged.
+
         Returns:
             True if reload was successful
         """
-        return await self._reload_config()
+        return await self._reload_config(force=True)
@@ -2,17 +2,86 @@
 
 from __future__ import annotations
 
+import logging
 import math
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
-from typing import Any
+from types import MappingProxyType
+from typing import Any, ClassVar, NamedTuple
 
 from shelly_exporter.config import TargetConfig
 
+logger = logging.getLogger(__name__)
 
-@dataclass
-class ChannelReading:
-    """Normalized reading from a device channel (switch or light)."""
+# Scalar float fields shared by switch and light channel status objects
+_FLOAT_KEYS_SWITCH = ("apower", "voltage", "freq", "current", "pf")
+_FLOAT_KEYS_LIGHT = ("brightness", *_FLOAT_KEYS_SWITCH)
+
+# Stand-in for absent or null nested status objects; never mutated
+_EMPTY: dict[str, Any] = {}
+# Shared empty channel list for drivers without channels (gateways)
+_NO_CHANNELS: tuple[ChannelReading, ...] = ()
+
+# Status component keys for the channel indices drivers accept
+SWITCH_KEYS = tuple(f"switch:{i}" for i in range(8))
+LIGHT_KEYS = tuple(f"light:{i}" for i in range(8))
+
+# Input component keys to probe, in index order: built-in inputs plus the
+# Plus Add-on peripheral range (input:100-104)
+_INPUT_KEYS = tuple((i, f"input:{i}") for i in (*range(8), *range(100, 105)))
+
+
+def _safe_float(value: Any) -> float | None:
+    """Safely convert value to float, returning None if not possible."""
+    # JSON numbers arrive as float/int; skip the generic conversion for those
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _bool_to_float(value: Any) -> float | None:
+    """Map a status flag to 1.0/0.0, keeping None as None."""
+    return None if value is None else (1.0 if value else 0.0)
+
+
+def _extract_floats(data: dict[str, Any], keys: tuple[str, ...]) -> list[float | None]:
+    """Convert several fields of a status object to floats in one pass.
+
+    Missing, null, or non-numeric values become None.
+    """
+    out: list[float | None] = []
+    append = out.append
+    get = data.get
+    for key in keys:
+        value = get(key)
+        if value is None:
+            append(None)
+        elif type(value) is float:
+            append(value)
+        elif type(value) is int:
+            append(float(value))
+        else:
+            try:
+                append(float(value))
+            except (TypeError, ValueError):
+                append(None)
+    return out
+
+
+class ChannelReading(NamedTuple):
+    """Normalized reading from a device channel (switch or light).
+
+    Readings are read-only rows consumed by the metrics layer, so they are
+    plain named tuples; keep the field order stable.
+    """
 
     channel_type: str  # "switch" or "light"
     channel_index: int
@@ -38,7 +107,7 @@ class ChannelReading:
         return value if value is not None else math.nan
 
 
-@dataclass
+@dataclass(slots=True)
 class InputReading:
     """Reading from an input channel (physical button/switch)."""
 
@@ -46,8 +115,7 @@ class InputReading:
     state: float | None = None  # 1.0 for on/pressed, 0.0 for off
 
 
-@dataclass
-class SystemReading:
+class SystemReading(NamedTuple):
     """System-level metrics from the device."""
 
     uptime_seconds: float | None = None
@@ -61,8 +129,7 @@ class SystemReading:
     unixtime: float | None = None
 
 
-@dataclass
-class WifiReading:
+class WifiReading(NamedTuple):
     """WiFi connection metrics."""
 
     rssi_dbm: float | None = None
@@ -71,15 +138,18 @@ class WifiReading:
     ssid: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConnectionStatus:
-    """Cloud and MQTT connection status."""
+    """Cloud and MQTT connection status.
+
+    Immutable, since instances are shared across devices (see _connection_status).
+    """
 
     cloud_connected: float | None = None  # 1.0 if connected, 0.0 otherwise
     mqtt_connected: float | None = None  # 1.0 if connected, 0.0 otherwise
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceReading:
     """Per-device reading metadata."""
 
@@ -87,19 +157,42 @@ class DeviceReading:
     up: bool = True
     poll_duration_seconds: float = 0.0
     error_message: str | None = None
-    channels: list[ChannelReading] = field(default_factory=list)
+    channels: Sequence[ChannelReading] = field(default_factory=list)
     inputs: list[InputReading] = field(default_factory=list)
     system: SystemReading | None = None
     wifi: WifiReading | None = None
     connection: ConnectionStatus | None = None
 
 
+# One shared ConnectionStatus per (cloud, mqtt) value pair; values are only
+# None/0.0/1.0, so this holds at most nine entries
+_CONNECTION_STATUS_CACHE: dict[tuple[float | None, float | None], ConnectionStatus] = {}
+
+
+def _connection_status(
+    cloud_connected: float | None, mqtt_connected: float | None
+) -> ConnectionStatus:
+    """Return the shared ConnectionStatus for a (cloud, mqtt) pair."""
+    key = (cloud_connected, mqtt_connected)
+    status = _CONNECTION_STATUS_CACHE.get(key)
+    if status is None:
+        status = ConnectionStatus(cloud_connected=cloud_connected, mqtt_connected=mqtt_connected)
+        _CONNECTION_STATUS_CACHE[key] = status
+    return status
+
+
 class DeviceDriver(ABC):
     """Base class for Shelly device drivers.
 
     Implement this interface to add support for new Shelly device models.
     """
 
+    # False for devices without switch/light channels; the poller then skips parse_status
+    HAS_CHANNELS: ClassVar[bool] = True
+
+    # Exact (gen, app) this driver handles, used by the registry for direct dispatch
+    _MATCH: ClassVar[tuple[int, str] | None] = None
+
     @property
     @abstractmethod
     def driver_id(self) -> str:
@@ -116,6 +209,9 @@ class DeviceDriver(ABC):
     def score(self, device_info: dict[str, Any]) -> int:
         """Score how well this driver matches the device.
 
+        The registry caches selection per (gen, app, model), so scores should
+        depend only on those fields.
+
         Args:
             device_info: Result from Shelly.GetDeviceInfo RPC call
 
@@ -125,15 +221,24 @@ class DeviceDriver(ABC):
         """
         ...
 
+    def match_keys(self) -> tuple[tuple[int, str], ...]:
+        """Return the exact (gen, app) pairs this driver handles.
+
+        The registry dispatches these with a dict lookup instead of scoring.
+        Defaults to _MATCH; override to claim several device families.
+        """
+        return (self._MATCH,) if self._MATCH is not None else ()
+
     @abstractmethod
-    def supported_channels(self, device_info: dict[str, Any]) -> dict[str, set[int]]:
+    def supported_channels(self, device_info: dict[str, Any]) -> Mapping[str, frozenset[int]]:
         """Return supported channel types and indices.
 
         Args:
             device_info: Result from Shelly.GetDeviceInfo RPC call
 
         Returns:
-            Dict mapping channel type to set of indices.
+            Read-only mapping of channel type to frozenset of indices; drivers may
+            return a shared class-level mapping.
             Example: {"switch": {0, 1, 2, 3}} or {"light": {0}}
         """
         ...
@@ -155,35 +260,57 @@ class DeviceDriver(ABC):
         """
         ...
 
-    def parse_system(self, status_result: dict[str, Any]) -> SystemReading | None:
-        """Parse system metrics from status.
+    def parse_meta(
+        self, status_result: dict[str, Any]
+    ) -> tuple[SystemReading | None, WifiReading | None, ConnectionStatus | None]:
+        """Parse system, WiFi, and connection status in one pass.
 
         Args:
             status_result: Result from Shelly.GetStatus RPC call
 
         Returns:
-            SystemReading with system metrics, or None if not available
+            Tuple of (system, wifi, connection) readings; each is None if not available
         """
-        sys_data = status_result.get("sys", {})
-        if not sys_data:
-            return None
+        get = status_result.get
+        return (
+            self._build_system(get("sys")),
+            self._build_wifi(get("wifi")),
+            self._build_connection(get("cloud"), get("mqtt")),
+        )
 
-        restart_req = sys_data.get("restart_required")
-        restart_val = None
-        if restart_req is not None:
-            restart_val = 1.0 if restart_req else 0.0
+    def parse_all(
+        self, status_result: dict[str, Any], target_config: TargetConfig
+    ) -> tuple[
+        Sequence[ChannelReading],
+        list[InputReading],
+        SystemReading | None,
+        WifiReading | None,
+        ConnectionStatus | None,
+    ]:
+        """Parse everything a poll publishes from one status response.
 
-        return SystemReading(
-            uptime_seconds=self._safe_float(sys_data.get("uptime")),
-            ram_size_bytes=self._safe_float(sys_data.get("ram_size")),
-            ram_free_bytes=self._safe_float(sys_data.get("ram_free")),
-            ram_min_free_bytes=self._safe_float(sys_data.get("ram_min_free")),
-            fs_size_bytes=self._safe_float(sys_data.get("fs_size")),
-            fs_free_bytes=self._safe_float(sys_data.get("fs_free")),
-            restart_required=restart_val,
-            cfg_rev=self._safe_float(sys_data.get("cfg_rev")),
-            unixtime=self._safe_float(sys_data.get("unixtime")),
+        Args:
+            status_result: Result from Shelly.GetStatus RPC call
+            target_config: Target configuration with channel settings
+
+        Returns:
+            Tuple of (channels, inputs, system, wifi, connection) readings
+        """
+        channels = (
+            self.parse_status(status_result, target_config) if self.HAS_CHANNELS else _NO_CHANNELS
         )
+        return (channels, self.parse_inputs(status_result), *self.parse_meta(status_result))
+
+    def parse_system(self, status_result: dict[str, Any]) -> SystemReading | None:
+        """Parse system metrics from status.
+
+        Args:
+            status_result: Result from Shelly.GetStatus RPC call
+
+        Returns:
+            SystemReading with system metrics, or None if not available
+        """
+        return self._build_system(status_result.get("sys"))
 
     def parse_wifi(self, status_result: dict[str, Any]) -> WifiReading | None:
         """Parse WiFi metrics from status.
@@ -194,7 +321,42 @@ class DeviceDriver(ABC):
         Returns:
             WifiReading with WiFi metrics, or None if not available
         """
-        wifi_data = status_result.get("wifi", {})
+        return self._build_wifi(status_result.get("wifi"))
+
+    def parse_connection_status(
+        self, status_result: dict[str, Any]
+    ) -> ConnectionStatus | None:
+        """Parse cloud and MQTT connection status.
+
+        Args:
+            status_result: Result from Shelly.GetStatus RPC call
+
+        Returns:
+            ConnectionStatus with connection info
+        """
+        return self._build_connection(status_result.get("cloud"), status_result.get("mqtt"))
+
+    def _build_system(self, sys_data: dict[str, Any] | None) -> SystemReading | None:
+        """Build a SystemReading from the "sys" status object."""
+        if not sys_data:
+            return None
+
+        sf = _safe_float
+        get = sys_data.get
+        return SystemReading(
+            uptime_seconds=sf(get("uptime")),
+            ram_size_bytes=sf(get("ram_size")),
+            ram_free_bytes=sf(get("ram_free")),
+            ram_min_free_bytes=sf(get("ram_min_free")),
+            fs_size_bytes=sf(get("fs_size")),
+            fs_free_bytes=sf(get("fs_free")),
+            restart_required=_bool_to_float(get("restart_required")),
+            cfg_rev=sf(get("cfg_rev")),
+            unixtime=sf(get("unixtime")),
+        )
+
+    def _build_wifi(self, wifi_data: dict[str, Any] | None) -> WifiReading | None:
+        """Build a WifiReading from the "wifi" status object."""
         if not wifi_data:
             return None
 
@@ -204,41 +366,33 @@ class DeviceDriver(ABC):
         connected = 1.0 if (sta_ip or status == "got ip") else 0.0
 
         return WifiReading(
-            rssi_dbm=self._safe_float(wifi_data.get("rssi")),
+            rssi_dbm=_safe_float(wifi_data.get("rssi")),
             connected=connected,
             sta_ip=sta_ip,
             ssid=wifi_data.get("ssid"),
         )
 
-    def parse_connection_status(
-        self, status_result: dict[str, Any]
+    def _build_connection(
+        self,
+        cloud_data: dict[str, Any] | None,
+        mqtt_data: dict[str, Any] | None,
     ) -> ConnectionStatus | None:
-        """Parse cloud and MQTT connection status.
-
-        Args:
-            status_result: Result from Shelly.GetStatus RPC call
-
-        Returns:
-            ConnectionStatus with connection info
-        """
-        cloud_data = status_result.get("cloud", {})
-        mqtt_data = status_result.get("mqtt", {})
+        """Build a ConnectionStatus from the "cloud" and "mqtt" status objects."""
+        cloud_data = cloud_data or _EMPTY
+        mqtt_data = mqtt_data or _EMPTY
 
         cloud_connected = None
-        if isinstance(cloud_data, dict) and "connected" in cloud_data:
+        if "connected" in cloud_data:
             cloud_connected = 1.0 if cloud_data["connected"] else 0.0
 
         mqtt_connected = None
-        if isinstance(mqtt_data, dict) and "connected" in mqtt_data:
+        if "connected" in mqtt_data:
             mqtt_connected = 1.0 if mqtt_data["connected"] else 0.0
 
         if cloud_connected is None and mqtt_connected is None:
             return None
 
-        return ConnectionStatus(
-            cloud_connected=cloud_connected,
-            mqtt_connected=mqtt_connected,
-        )
+        return _connection_status(cloud_connected, mqtt_connected)
 
     def parse_inputs(self, status_result: dict[str, Any]) -> list[InputReading]:
         """Parse input channel states from status.
@@ -250,22 +404,15 @@ class DeviceDriver(ABC):
             List of InputReading objects for all found inputs
         """
         inputs: list[InputReading] = []
+        bf = _bool_to_float
+        get = status_result.get
+
+        # Probe the known input keys directly; already in index order
+        for idx, key in _INPUT_KEYS:
+            value = get(key)
+            if isinstance(value, dict):
+                inputs.append(InputReading(input_index=idx, state=bf(value.get("state"))))
 
-        # Look for input:0, input:1, input:2, input:3, etc.
-        for key, value in status_result.items():
-            if key.startswith("input:") and isinstance(value, dict):
-                try:
-                    idx = int(key.split(":")[1])
-                    state_val = value.get("state")
-                    state = None
-                    if state_val is not None:
-                        state = 1.0 if state_val else 0.0
-                    inputs.append(InputReading(input_index=idx, state=state))
-                except (ValueError, IndexError):
-                    continue
-
-        # Sort by index for consistent ordering
-        inputs.sort(key=lambda x: x.input_index)
         return inputs
 
     def _parse_switch_channel(
@@ -274,94 +421,154 @@ class DeviceDriver(ABC):
         channel_index: int,
     ) -> ChannelReading:
         """Helper to parse common switch channel data."""
-        output_val = switch_data.get("output")
-        output = 1.0 if output_val else 0.0 if output_val is not None else None
+        return self._parse_channel(switch_data, channel_index, "switch")
+
+    def _parse_light_channel(
+        self,
+        light_data: dict[str, Any],
+        channel_index: int,
+    ) -> ChannelReading:
+        """Helper to parse common light channel data."""
+        # Lights typically don't return energy
+        return self._parse_channel(
+            light_data, channel_index, "light", has_brightness=True, has_ret_energy=False
+        )
+
+    def _parse_channel(
+        self,
+        data: dict[str, Any],
+        channel_index: int,
+        kind: str,
+        *,
+        has_brightness: bool = False,
+        has_ret_energy: bool = True,
+    ) -> ChannelReading:
+        """Parse a switch or light status object into a ChannelReading.
+
+        Args:
+            data: The "switch:N" or "light:N" status object
+            channel_index: Channel index N
+            kind: Channel type ("switch" or "light")
+            has_brightness: Read the brightness field
+            has_ret_energy: Read the returned energy total
+
+        Returns:
+            ChannelReading for the channel
+        """
+        get = data.get
+        output = _bool_to_float(get("output"))
+
+        # Switches have no brightness field; skip its lookup rather than discard it
+        brightness: float | None
+        if has_brightness:
+            brightness, apower, voltage, freq, current, pf = _extract_floats(
+                data, _FLOAT_KEYS_LIGHT
+            )
+        else:
+            brightness = None
+            apower, voltage, freq, current, pf = _extract_floats(data, _FLOAT_KEYS_SWITCH)
 
         # Extract temperature, handling null values
-        temp_c = None
-        temp_data = switch_data.get("temperature", {})
-        if isinstance(temp_data, dict):
-            tc = temp_data.get("tC")
-            if tc is not None:
-                temp_c = float(tc)
+        tc = (get("temperature") or _EMPTY).get("tC")
+        temp_c = float(tc) if tc is not None else None
 
         # Extract energy totals
-        aenergy_wh = None
-        aenergy_data = switch_data.get("aenergy", {})
-        if isinstance(aenergy_data, dict):
-            total = aenergy_data.get("total")
-            if total is not None:
-                aenergy_wh = float(total)
+        total = (get("aenergy") or _EMPTY).get("total")
+        aenergy_wh = float(total) if total is not None else None
 
         ret_aenergy_wh = None
-        ret_aenergy_data = switch_data.get("ret_aenergy", {})
-        if isinstance(ret_aenergy_data, dict):
-            total = ret_aenergy_data.get("total")
-            if total is not None:
-                ret_aenergy_wh = float(total)
+        if has_ret_energy:
+            total = (get("ret_aenergy") or _EMPTY).get("total")
+            ret_aenergy_wh = float(total) if total is not None else None
 
         return ChannelReading(
-            channel_type="switch",
+            channel_type=kind,
             channel_index=channel_index,
             output=output,
-            apower_w=self._safe_float(switch_data.get("apower")),
-            voltage_v=self._safe_float(switch_data.get("voltage")),
-            freq_hz=self._safe_float(switch_data.get("freq")),
-            current_a=self._safe_float(switch_data.get("current")),
-            pf=self._safe_float(switch_data.get("pf")),
+            apower_w=apower,
+            voltage_v=voltage,
+            freq_hz=freq,
+            current_a=current,
+            pf=pf,
             temp_c=temp_c,
             aenergy_wh=aenergy_wh,
             ret_aenergy_wh=ret_aenergy_wh,
+            brightness=brightness,
         )
 
-    def _parse_light_channel(
-        self,
-        light_data: dict[str, Any],
-        channel_index: int,
-    ) -> ChannelReading:
-        """Helper to parse common light channel data."""
-        output_val = light_data.get("output")
-        output = 1.0 if output_val else 0.0 if output_val is not None else None
-
-        brightness = self._safe_float(light_data.get("brightness"))
-
-        # Extract temperature if available
-        temp_c = None
-        temp_data = light_data.get("temperature", {})
-        if isinstance(temp_data, dict):
-            tc = temp_data.get("tC")
-            if tc is not None:
-                temp_c = float(tc)
-
-        # Extract energy totals if available
-        aenergy_wh = None
-        aenergy_data = light_data.get("aenergy", {})
-        if isinstance(aenergy_data, dict):
-            total = aenergy_data.get("total")
-            if total is not None:
-                aenergy_wh = float(total)
+    # Kept for subclasses that call self._safe_float
+    _safe_float = staticmethod(_safe_float)
 
-        return ChannelReading(
-            channel_type="light",
-            channel_index=channel_index,
-            output=output,
-            brightness=brightness,
-            apower_w=self._safe_float(light_data.get("apower")),
-            voltage_v=self._safe_float(light_data.get("voltage")),
-            freq_hz=self._safe_float(light_data.get("freq")),
-            current_a=self._safe_float(light_data.get("current")),
-            pf=self._safe_float(light_data.get("pf")),
-            temp_c=temp_c,
-            aenergy_wh=aenergy_wh,
-            ret_aenergy_wh=None,  # Lights typically don't return energy
-        )
 
-    @staticmethod
-    def _safe_float(value: Any) -> float | None:
-        """Safely convert value to float, returning None if not possible."""
-        if value is None:
-            return None
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return None
+class SwitchOnlyDriver(DeviceDriver):
+    """Base class for drivers of devices that expose only switch channels.
+
+    Subclasses set _MATCH, _SUPPORTED, _DEVICE_LABEL and _VALID_RANGE; scoring,
+    channel support and status parsing are shared.
+    """
+
+    _MATCH: ClassVar[tuple[int, str]]  # (gen, app) from Shelly.GetDeviceInfo
+    _SUPPORTED: ClassVar[frozenset[int]]  # Valid switch indices
+    _DEVICE_LABEL: ClassVar[str]  # Short model name used in log messages
+    _VALID_RANGE: ClassVar[str]  # Human-readable index range, e.g. "0-3"
+    _SUPPORTED_CHANNELS: ClassVar[Mapping[str, frozenset[int]]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "_SUPPORTED" in cls.__dict__:
+            # Read-only, since every instance of the driver returns this mapping
+            cls._SUPPORTED_CHANNELS = MappingProxyType({"switch": cls._SUPPORTED})
+
+    def score(self, device_info: dict[str, Any]) -> int:
+        """Score this driver for the device."""
+        key = (device_info.get("gen"), device_info.get("app", ""))
+        return 100 if key == self._MATCH else 0  # Exact match
+
+    def supported_channels(self, device_info: dict[str, Any]) -> Mapping[str, frozenset[int]]:
+        """Return the switch channels this device has."""
+        return self._SUPPORTED_CHANNELS
+
+    def parse_status(
+        self,
+        status_result: dict[str, Any],
+        target_config: TargetConfig,
+    ) -> list[ChannelReading]:
+        """Parse switch status into channel readings."""
+        readings: list[ChannelReading] = []
+        append = readings.append
+        supported = self._SUPPORTED
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        for channel_cfg in target_config.channels:
+            if channel_cfg.type != "switch":
+                logger.warning(
+                    "Target '%s': %s only supports switch channels, ignoring %s:%s",
+                    target_config.name,
+                    self._DEVICE_LABEL,
+                    channel_cfg.type,
+                    channel_cfg.index,
+                )
+                continue
+
+            idx = channel_cfg.index
+            if idx not in supported:
+                logger.warning(
+                    "Target '%s': Channel index %s out of range for %s (valid: %s), skipping",
+                    target_config.name,
+                    idx,
+                    self._DEVICE_LABEL,
+                    self._VALID_RANGE,
+                )
+                continue
+
+            switch_key = SWITCH_KEYS[idx]
+            switch_data = status_result.get(switch_key)
+
+            if not switch_data:
+                if debug:
+                    logger.debug("Target '%s': No data for %s", target_config.name, switch_key)
+                continue
+
+            append(self._parse_switch_channel(switch_data, idx))
+
+        return readings
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, ClassVar
 
 from shelly_exporter.config import TargetConfig
 from shelly_exporter.drivers.base import ChannelReading, DeviceDriver
@@ -28,6 +30,10 @@ class BluGwGen2Driver(DeviceDriver):
     - Standard sys, wifi, cloud, mqtt sections
     """
 
+    HAS_CHANNELS = False
+    _MATCH = (2, "BluGw")  # (gen, app) from Shelly.GetDeviceInfo
+    _SUPPORTED_CHANNELS: ClassVar[Mapping[str, frozenset[int]]] = MappingProxyType({})
+
     @property
     def driver_id(self) -> str:
         return "blugw_gen2"
@@ -38,22 +44,17 @@ class BluGwGen2Driver(DeviceDriver):
 
     def score(self, device_info: dict[str, Any]) -> int:
         """Score how well this driver matches the device."""
-        gen = device_info.get("gen")
-        app = device_info.get("app", "")
-
         # Exact match for BLU Gateway Gen2
-        if gen == 2 and app == "BluGw":
-            return 100
-
-        return 0
+        key = (device_info.get("gen"), device_info.get("app", ""))
+        return 100 if key == self._MATCH else 0
 
-    def supported_channels(self, device_info: dict[str, Any]) -> dict[str, set[int]]:
+    def supported_channels(self, device_info: dict[str, Any]) -> Mapping[str, frozenset[int]]:
         """Return supported channel types and indices.
 
         BLU Gateway has no switch/light channels - it's a gateway device.
-        Returns empty dict but device can still be monitored for system metrics.
+        Returns an empty mapping but device can still be monitored for system metrics.
         """
-        return {}
+        return self._SUPPORTED_CHANNELS
 
     def parse_status(
         self, status_result: dict[str, Any], target_config: TargetConfig
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, ClassVar
 
 from shelly_exporter.config import TargetConfig
-from shelly_exporter.drivers.base import ChannelReading, DeviceDriver
+from shelly_exporter.drivers.base import LIGHT_KEYS, ChannelReading, DeviceDriver
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,13 @@ class Dimmer0110VPMG3Driver(DeviceDriver):
     Channels: light:0 (NOT switch!)
     """
 
+    _MATCH = (3, "Dimmer0110VPMG3")  # (gen, app) from Shelly.GetDeviceInfo
+    _CHANNEL_KIND = "light"
+    _SUPPORTED: frozenset[int] = frozenset({0})
+    _SUPPORTED_CHANNELS: ClassVar[Mapping[str, frozenset[int]]] = MappingProxyType(
+        {_CHANNEL_KIND: _SUPPORTED}
+    )
+
     @property
     def driver_id(self) -> str:
         return "dimmer_0110vpm_g3"
@@ -28,16 +37,12 @@ class Dimmer0110VPMG3Driver(DeviceDriver):
 
     def score(self, device_info: dict[str, Any]) -> int:
         """Score this driver for the device."""
-        gen = device_info.get("gen")
-        app = device_info.get("app", "")
-
-        if gen == 3 and app == "Dimmer0110VPMG3":
-            return 100  # Exact match
-        return 0
+        key = (device_info.get("gen"), device_info.get("app", ""))
+        return 100 if key == self._MATCH else 0  # Exact match
 
-    def supported_channels(self, device_info: dict[str, Any]) -> dict[str, set[int]]:
+    def supported_channels(self, device_info: dict[str, Any]) -> Mapping[str, frozenset[int]]:
         """Dimmer has 1 light channel."""
-        return {"light": {0}}
+        return self._SUPPORTED_CHANNELS
 
     def parse_status(
         self,
@@ -46,32 +51,36 @@ class Dimmer0110VPMG3Driver(DeviceDriver):
     ) -> list[ChannelReading]:
         """Parse Dimmer status into channel readings."""
         readings: list[ChannelReading] = []
-        supported = self.supported_channels({})
+        append = readings.append
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         for channel_cfg in target_config.channels:
-            if channel_cfg.type != "light":
+            if channel_cfg.type != self._CHANNEL_KIND:
                 logger.warning(
-                    f"Target '{target_config.name}': Dimmer only supports light channels, "
-                    f"ignoring {channel_cfg.type}:{channel_cfg.index}"
+                    "Target '%s': Dimmer only supports light channels, ignoring %s:%s",
+                    target_config.name,
+                    channel_cfg.type,
+                    channel_cfg.index,
                 )
                 continue
 
             idx = channel_cfg.index
-            if idx not in supported.get("light", set()):
+            if idx not in self._SUPPORTED:
                 logger.warning(
-                    f"Target '{target_config.name}': Channel index {idx} out of range for Dimmer "
-                    f"(valid: 0), skipping"
+                    "Target '%s': Channel index %s out of range for Dimmer (valid: 0), skipping",
+                    target_config.name,
+                    idx,
                 )
                 continue
 
-            light_key = f"light:{idx}"
-            light_data = status_result.get(light_key, {})
+            light_key = LIGHT_KEYS[idx]
+            light_data = status_result.get(light_key)
 
             if not light_data:
-                logger.debug(f"Target '{target_config.name}': No data for {light_key}")
+                if debug:
+                    logger.debug("Target '%s': No data for %s", target_config.name, light_key)
                 continue
 
-            reading = self._parse_light_channel(light_data, idx)
-            readings.append(reading)
+            append(self._parse_light_channel(light_data, idx))
 
         return readings
@@ -3,10 +3,17 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, ClassVar
 
 from shelly_exporter.config import TargetConfig
-from shelly_exporter.drivers.base import ChannelReading, DeviceDriver
+from shelly_exporter.drivers.base import (
+    LIGHT_KEYS,
+    ChannelReading,
+    DeviceDriver,
+    _bool_to_float,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +31,11 @@ class PlusWallDimmerGen2Driver(DeviceDriver):
     - No power metering (no apower, voltage, current, etc.)
     """
 
+    _MATCH = (2, "PlusWallDimmer")  # (gen, app) from Shelly.GetDeviceInfo
+    _SUPPORTED_CHANNELS: ClassVar[Mapping[str, frozenset[int]]] = MappingProxyType(
+        {"light": frozenset({0})}
+    )
+
     @property
     def driver_id(self) -> str:
         return "pluswalldimmer_gen2"
@@ -34,35 +46,33 @@ class PlusWallDimmerGen2Driver(DeviceDriver):
 
     def score(self, device_info: dict[str, Any]) -> int:
         """Score how well this driver matches the device."""
-        gen = device_info.get("gen")
-        app = device_info.get("app", "")
-
         # Exact match for Plus Wall Dimmer Gen2
-        if gen == 2 and app == "PlusWallDimmer":
-            return 100
+        key = (device_info.get("gen"), device_info.get("app", ""))
+        return 100 if key == self._MATCH else 0
 
-        return 0
-
-    def supported_channels(self, device_info: dict[str, Any]) -> dict[str, set[int]]:
+    def supported_channels(self, device_info: dict[str, Any]) -> Mapping[str, frozenset[int]]:
         """Return supported channel types and indices."""
-        return {"light": {0}}
+        return self._SUPPORTED_CHANNELS
 
     def parse_status(
         self, status_result: dict[str, Any], target_config: TargetConfig
     ) -> list[ChannelReading]:
         """Parse status into channel readings."""
         readings: list[ChannelReading] = []
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         for channel in target_config.channels:
             if channel.type != "light":
-                logger.debug(
-                    f"Skipping non-light channel type '{channel.type}' for Wall Dimmer"
-                )
+                if debug:
+                    logger.debug(
+                        "Skipping non-light channel type '%s' for Wall Dimmer", channel.type
+                    )
                 continue
 
-            key = f"light:{channel.index}"
+            idx = channel.index
+            key = LIGHT_KEYS[idx] if 0 <= idx < len(LIGHT_KEYS) else f"light:{idx}"
             if key not in status_result:
-                logger.warning(f"Channel {key} not found in status")
+                logger.warning("Channel %s not found in status", key)
                 continue
 
             light_data = status_result[key]
@@ -70,9 +80,7 @@ class PlusWallDimmerGen2Driver(DeviceDriver):
             # Parse output state
             output = None
             if not channel.ignore_output:
-                raw_output = light_data.get("output")
-                if raw_output is not None:
-                    output = 1.0 if raw_output else 0.0
+                output = _bool_to_float(light_data.get("output"))
 
             # Parse brightness
             brightness = None
@@ -17,51 +17,99 @@ from shelly_exporter.drivers.s1pm_gen4 import Shelly1PMGen4Driver
 
 logger = logging.getLogger(__name__)
 
+# Device info no driver should claim; scored once at registration to validate score()
+_PROBE_DEVICE_INFO: dict[str, Any] = {"gen": -1, "app": "__probe__", "model": "__probe__"}
+
 
 class DriverRegistry:
     """Registry for device drivers.
 
-    Supports automatic driver selection based on device info scoring.
+    Drivers that declare an exact (gen, app) match are dispatched with a single
+    dict lookup; other devices fall back to scoring every registered driver.
     """
 
     def __init__(self) -> None:
         self._drivers: list[DeviceDriver] = []
+        # Exact (gen, app) -> driver, from each driver's match_keys(); first registration wins
+        self._by_match: dict[tuple[int, str], DeviceDriver] = {}
+        # Selection result per (gen, app, model); cleared whenever a driver is registered
+        self._selection_cache: dict[tuple[Any, Any, Any], DeviceDriver | None] = {}
 
     def register(self, driver: DeviceDriver) -> None:
-        """Register a driver instance."""
+        """Register a driver instance.
+
+        The driver's score() is called once with probe device info; a driver
+        that raises is rejected here, so selection can score without guards.
+        """
+        try:
+            driver.score(_PROBE_DEVICE_INFO)
+        except Exception as e:
+            logger.error("Rejected driver %s: score() raised: %s", driver.driver_id, e)
+            return
+
         self._drivers.append(driver)
-        logger.debug(f"Registered driver: {driver.driver_id} ({driver.driver_name})")
+        for key in driver.match_keys():
+            self._by_match.setdefault(key, driver)
+        self._selection_cache.clear()
+        logger.debug("Registered driver: %s (%s)", driver.driver_id, driver.driver_name)
 
     def get_best_driver(self, device_info: dict[str, Any]) -> DeviceDriver | None:
         """Find the best matching driver for a device.
 
+        Drivers with an exact (gen, app) match are found by dict lookup; other
+        devices are scored against every driver. The result is memoized per
+        (gen, app, model), so repeat lookups for the same device type are O(1).
+
         Args:
             device_info: Result from Shelly.GetDeviceInfo RPC call
 
         Returns:
             Best matching driver, or None if no driver supports this device
         """
+        gen = device_info.get("gen")
+        app = device_info.get("app")
+        key = (gen, app, device_info.get("model"))
+        try:
+            return self._selection_cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable values from a malformed response; score without caching
+            return self._select_driver(device_info)
+
+        driver = None
+        if isinstance(gen, int) and isinstance(app, str):
+            driver = self._by_match.get((gen, app))
+        if driver is None:
+            driver = self._select_driver(device_info)
+        self._selection_cache[key] = driver
+        return driver
+
+    def _select_driver(self, device_info: dict[str, Any]) -> DeviceDriver | None:
+        """Score every registered driver and return the best match."""
         best_driver: DeviceDriver | None = None
         best_score = 0
 
         for driver in self._drivers:
-            try:
-                score = driver.score(device_info)
-                if score > best_score:
-                    best_score = score
-                    best_driver = driver
-            except Exception as e:
-                logger.warning(f"Error scoring driver {driver.driver_id}: {e}")
+            score = driver.score(device_info)
+            if score > best_score:
+                best_score = score
+                best_driver = driver
 
         if best_driver:
             logger.debug(
-                f"Selected driver {best_driver.driver_id} (score={best_score}) "
-                f"for device: gen={device_info.get('gen')}, app={device_info.get('app')}"
+                "Selected driver %s (score=%d) for device: gen=%s, app=%s",
+                best_driver.driver_id,
+                best_score,
+                device_info.get("gen"),
+                device_info.get("app"),
             )
         else:
             logger.warning(
-                f"No driver found for device: gen={device_info.get('gen')}, "
-                f"app={device_info.get('app')}, model={device_info.get('model')}"
+                "No driver found for device: gen=%s, app=%s, model=%s",
+                device_info.get("gen"),
+                device_info.get("app"),
+                device_info.get("model"),
             )
 
         return best_driver
@@ -71,23 +119,25 @@ class DriverRegistry:
         return list(self._drivers)
 
 
-# Global registry instance
-_registry: DriverRegistry | None = None
+def _build_registry() -> DriverRegistry:
+    """Create a registry with all built-in drivers registered."""
+    registry = DriverRegistry()
+    registry.register(Pro2PMGen2Driver())
+    registry.register(Pro4PMGen2Driver())
+    registry.register(Shelly1PMGen4Driver())
+    registry.register(PlugUSGen2Driver())
+    registry.register(Dimmer0110VPMG3Driver())
+    registry.register(PlusWallDimmerGen2Driver())
+    registry.register(BluGwGen2Driver())
+    registry.register(BluGwGen3Driver())
+    logger.debug("Initialized driver registry with %d drivers", len(registry._drivers))
+    return registry
+
+
+# Global registry instance, built once at import
+_registry = _build_registry()
 
 
 def get_registry() -> DriverRegistry:
-    """Get the global driver registry, creating it if needed."""
-    global _registry
-    if _registry is None:
-        _registry = DriverRegistry()
-        # Register all built-in drivers
-        _registry.register(Pro2PMGen2Driver())
-        _registry.register(Pro4PMGen2Driver())
-        _registry.register(Shelly1PMGen4Driver())
-        _registry.register(PlugUSGen2Driver())
-        _registry.register(Dimmer0110VPMG3Driver())
-        _registry.register(PlusWallDimmerGen2Driver())
-        _registry.register(BluGwGen2Driver())
-        _registry.register(BluGwGen3Driver())
-        logger.info(f"Initialized driver registry with {len(_registry._drivers)} drivers")
+    """Get the global driver registry."""
     return _registry
@@ -17,13 +17,23 @@ from shelly_exporter.poller import DevicePoller
 from shelly_exporter.scanner import NetworkScanner
 from shelly_exporter.web import run_server
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency, unavailable on Windows
+    uvloop = None
+
 
 def setup_logging(level: str) -> None:
-    """Configure logging with timestamps."""
+    """Configure logging with timestamps.
+
+    Replaces any handlers installed earlier (such as the startup handler in
+    main()), so the configured level and format take effect.
+    """
     logging.basicConfig(
         level=getattr(logging, level.upper()),
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
+        force=True,
     )
 
 
@@ -95,10 +105,23 @@ async def async_main(config_path: Path | None) -> None:
         debounce_seconds=1.0,
     )
 
-    # Create discovery callback that adds targets to poller
+    # Discovered targets are queued so the scanner never waits on the poller
+    discovered_queue: asyncio.Queue[TargetConfig] = asyncio.Queue()
+
     async def on_device_discovered(target: TargetConfig) -> None:
-        if not poller.has_target_url(target.url):
-            await poller.add_target(target)
+        discovered_queue.put_nowait(target)
+
+    async def add_discovered_targets() -> None:
+        while True:
+            target = await discovered_queue.get()
+            try:
+                if not poller.has_target_url(target.url):
+                    await poller.add_target(target)
+            except Exception:
+                # Keep the consumer alive; one bad target must not stop later additions
+                logger.exception(f"Failed to add discovered target '{target.name}'")
+            finally:
+                discovered_queue.task_done()
 
     # Create network scanner (if discovery enabled)
     scanner: NetworkScanner | None = None
@@ -135,7 +158,9 @@ async def async_main(config_path: Path | None) -> None:
 
     # Start scanner in background (if enabled)
     scanner_task: asyncio.Task[None] | None = None
+    discovery_task: asyncio.Task[None] | None = None
     if scanner:
+        discovery_task = asyncio.create_task(add_discovered_targets())
         await scanner.start()
         # Scanner runs its own background task, but we need to track it for cleanup
 
@@ -152,6 +177,12 @@ async def async_main(config_path: Path | None) -> None:
         # Stop scanner first
         if scanner:
             await scanner.stop()
+        if discovery_task:
+            discovery_task.cancel()
+            try:
+                await discovery_task
+            except asyncio.CancelledError:
+                pass
 
         await poller.stop()
         poller_task.cancel()
@@ -173,8 +204,11 @@ def main() -> None:
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
+    # Prefer uvloop's event loop when available
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+
     try:
-        asyncio.run(async_main(args.config))
+        asyncio.run(async_main(args.config), loop_factory=loop_factory)
     except KeyboardInterrupt:
         pass
 
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import logging
 import math
-import time
+from operator import attrgetter
+from time import time as _time
+from typing import Any
 
 from prometheus_client import Counter, Gauge
 
@@ -20,6 +22,23 @@ from shelly_exporter.drivers.base import (
 
 logger = logging.getLogger(__name__)
 
+# Exported for readings that are missing a value
+_NAN = math.nan
+
+# Bumped by every update function, so the /metrics handler can reuse its last output
+_metrics_version = 0
+
+
+def metrics_version() -> int:
+    """Return a counter that changes whenever exporter metrics are updated."""
+    return _metrics_version
+
+
+def _mark_changed() -> None:
+    """Record that metric values changed since the last rendered scrape."""
+    global _metrics_version
+    _metrics_version += 1
+
 # =============================================================================
 # Per-device metrics
 # =============================================================================
@@ -47,6 +66,12 @@ shelly_poll_errors = Counter(
     ["device"],
 )
 
+shelly_poll_skipped = Counter(
+    "shelly_poll_skipped_total",
+    "Scheduled polls skipped because the previous poll was still running",
+    ["device"],
+)
+
 # =============================================================================
 # System metrics
 # =============================================================================
@@ -306,20 +331,40 @@ def _get_channel_config(
     channel_index: int,
 ) -> ChannelConfig | None:
     """Find channel config matching type and index."""
-    for ch in target_config.channels:
-        if ch.type == channel_type and ch.index == channel_index:
-            return ch
-    return None
+    return target_config.get_channel(channel_type, channel_index)
 
 
-def _set_gauge_value(
-    gauge: Gauge, labels: dict[str, str], value: float | None
-) -> None:
-    """Set gauge value, using NaN for None values."""
-    if value is None:
-        gauge.labels(**labels).set(math.nan)
-    else:
-        gauge.labels(**labels).set(value)
+# Labeled gauge children, so repeat polls skip prometheus_client's labels() lookup.
+# Keyed by (id(gauge), label values); gauges are module-level and never collected.
+_child_cache: dict[tuple[int, Any], Any] = {}
+
+# Keys each device (first label value) holds in the caches below, as (cache, key)
+# pairs, so forgetting a device only touches its own entries.
+_device_cache_keys: dict[str, set[tuple[str, Any]]] = {}
+
+
+def _track_cache_key(device_name: str, cache: str, key: Any) -> None:
+    """Record that device_name owns key in the named cache."""
+    keys = _device_cache_keys.get(device_name)
+    if keys is None:
+        keys = _device_cache_keys[device_name] = set()
+    keys.add((cache, key))
+
+
+def _gauge_child(gauge: Gauge, values: tuple[str, ...]) -> Any:
+    """Return the labeled child for label values given in the gauge's label order."""
+    key = (id(gauge), values)
+    child = _child_cache.get(key)
+    if child is None:
+        child = _child_cache[key] = gauge.labels(*values)
+        if values:
+            _track_cache_key(values[0], "child", key)
+    return child
+
+
+def _set_child_value(gauge: Gauge, values: tuple[str, ...], value: float | None) -> None:
+    """Set a labeled gauge value from positional label values, using NaN for None."""
+    _gauge_child(gauge, values).set(_NAN if value is None else value)
 
 
 # =============================================================================
@@ -327,57 +372,102 @@ def _set_gauge_value(
 # =============================================================================
 def update_device_metrics(reading: DeviceReading) -> None:
     """Update per-device metrics from a reading."""
+    _mark_changed()
     device = reading.device_name
 
     # Update device-level metrics
-    shelly_up.labels(device=device).set(1.0 if reading.up else 0.0)
-    shelly_poll_duration.labels(device=device).set(reading.poll_duration_seconds)
+    values = (device,)
+    _gauge_child(shelly_up, values).set(1.0 if reading.up else 0.0)
+    _gauge_child(shelly_poll_duration, values).set(reading.poll_duration_seconds)
 
     if reading.up:
-        shelly_last_poll_timestamp.labels(device=device).set(time.time())
+        _gauge_child(shelly_last_poll_timestamp, values).set(_time())
 
     if not reading.up and reading.error_message:
         shelly_poll_errors.labels(device=device).inc()
-        logger.warning(f"Device '{device}' poll failed: {reading.error_message}")
+        logger.warning("Device '%s' poll failed: %s", device, reading.error_message)
+
+
+def update_poll_skipped(device_name: str, count: int) -> None:
+    """Record polls skipped while a slow poll of the device was in flight."""
+    _mark_changed()
+    shelly_poll_skipped.labels(device=device_name).inc(count)
+
+
+# (gauge, reading field) for the per-device sections of a reading
+_SYSTEM_METRICS = (
+    (shelly_sys_uptime, "uptime_seconds"),
+    (shelly_sys_ram_size, "ram_size_bytes"),
+    (shelly_sys_ram_free, "ram_free_bytes"),
+    (shelly_sys_ram_min_free, "ram_min_free_bytes"),
+    (shelly_sys_fs_size, "fs_size_bytes"),
+    (shelly_sys_fs_free, "fs_free_bytes"),
+    (shelly_sys_restart_required, "restart_required"),
+    (shelly_sys_cfg_rev, "cfg_rev"),
+)
+
+_WIFI_METRICS = (
+    (shelly_wifi_rssi, "rssi_dbm"),
+    (shelly_wifi_connected, "connected"),
+)
+
+_CONNECTION_METRICS = (
+    (shelly_cloud_connected, "cloud_connected"),
+    (shelly_mqtt_connected, "mqtt_connected"),
+)
+
+# Emit plans: (labeled child's bound set, field getter) pairs with labels already applied.
+# Keyed by (id(metrics table), label values); the tables are module-level constants.
+_EmitPlan = tuple[tuple[Any, Any], ...]
+_emit_plans: dict[tuple[int, tuple[str, ...]], _EmitPlan] = {}
+
+
+def _emit_plan(
+    table: tuple[tuple[Gauge, str], ...], values: tuple[str, ...]
+) -> _EmitPlan:
+    """Return the (setter, getter) pairs for table with the given label values applied."""
+    key = (id(table), values)
+    plan = _emit_plans.get(key)
+    if plan is None:
+        plan = _emit_plans[key] = tuple(
+            (_gauge_child(gauge, values).set, attrgetter(field)) for gauge, field in table
+        )
+        _track_cache_key(values[0], "emit", key)
+    return plan
+
+
+def _emit(plan: _EmitPlan, reading: Any) -> None:
+    """Set every child in plan from the matching field of reading, using NaN for None."""
+    for set_value, get_value in plan:
+        value = get_value(reading)
+        set_value(_NAN if value is None else value)
 
 
 def update_system_metrics(device_name: str, system: SystemReading) -> None:
     """Update system metrics from a SystemReading."""
-    labels = {"device": device_name}
-
-    _set_gauge_value(shelly_sys_uptime, labels, system.uptime_seconds)
-    _set_gauge_value(shelly_sys_ram_size, labels, system.ram_size_bytes)
-    _set_gauge_value(shelly_sys_ram_free, labels, system.ram_free_bytes)
-    _set_gauge_value(shelly_sys_ram_min_free, labels, system.ram_min_free_bytes)
-    _set_gauge_value(shelly_sys_fs_size, labels, system.fs_size_bytes)
-    _set_gauge_value(shelly_sys_fs_free, labels, system.fs_free_bytes)
-    _set_gauge_value(shelly_sys_restart_required, labels, system.restart_required)
-    _set_gauge_value(shelly_sys_cfg_rev, labels, system.cfg_rev)
+    _mark_changed()
+    _emit(_emit_plan(_SYSTEM_METRICS, (device_name,)), system)
 
 
 def update_wifi_metrics(device_name: str, wifi: WifiReading) -> None:
     """Update WiFi metrics from a WifiReading."""
-    labels = {"device": device_name}
-
-    _set_gauge_value(shelly_wifi_rssi, labels, wifi.rssi_dbm)
-    _set_gauge_value(shelly_wifi_connected, labels, wifi.connected)
+    _mark_changed()
+    _emit(_emit_plan(_WIFI_METRICS, (device_name,)), wifi)
 
 
 def update_connection_metrics(
     device_name: str, connection: ConnectionStatus
 ) -> None:
     """Update connection status metrics."""
-    labels = {"device": device_name}
-
-    _set_gauge_value(shelly_cloud_connected, labels, connection.cloud_connected)
-    _set_gauge_value(shelly_mqtt_connected, labels, connection.mqtt_connected)
+    _mark_changed()
+    _emit(_emit_plan(_CONNECTION_METRICS, (device_name,)), connection)
 
 
 def update_input_metrics(device_name: str, inputs: list[InputReading]) -> None:
     """Update input channel metrics."""
+    _mark_changed()
     for inp in inputs:
-        labels = {"device": device_name, "input": str(inp.input_index)}
-        _set_gauge_value(shelly_input_state, labels, inp.state)
+        _set_child_value(shelly_input_state, (device_name, str(inp.input_index)), inp.state)
 
 
 def update_channel_metrics(
@@ -392,55 +482,106 @@ def update_channel_metrics(
         reading: Channel reading data
         channel_config: Optional channel config for ignore flags
     """
+    _mark_changed()
     if reading.channel_type == "switch":
         _update_switch_metrics(device_name, reading, channel_config)
     elif reading.channel_type == "light":
         _update_light_metrics(device_name, reading, channel_config)
     else:
-        logger.warning(f"Unknown channel type: {reading.channel_type}")
+        logger.warning("Unknown channel type: %s", reading.channel_type)
+
+
+# (ignore flag, gauge, ChannelReading field) for each per-channel metric
+_SWITCH_METRICS = (
+    ("ignore_output", shelly_switch_output, "output"),
+    ("ignore_active_power", shelly_switch_apower, "apower_w"),
+    ("ignore_voltage", shelly_switch_voltage, "voltage_v"),
+    ("ignore_frequency", shelly_switch_frequency, "freq_hz"),
+    ("ignore_current", shelly_switch_current, "current_a"),
+    ("ignore_power_factor", shelly_switch_power_factor, "pf"),
+    ("ignore_temperature", shelly_switch_temperature, "temp_c"),
+    ("ignore_total_active_energy", shelly_switch_aenergy, "aenergy_wh"),
+    ("ignore_total_returned_active_energy", shelly_switch_ret_aenergy, "ret_aenergy_wh"),
+)
+
+_LIGHT_METRICS = (
+    ("ignore_output", shelly_light_output, "output"),
+    ("ignore_brightness", shelly_light_brightness, "brightness"),
+    ("ignore_active_power", shelly_light_apower, "apower_w"),
+    ("ignore_total_active_energy", shelly_light_aenergy, "aenergy_wh"),
+    ("ignore_voltage", shelly_light_voltage, "voltage_v"),
+    ("ignore_current", shelly_light_current, "current_a"),
+    ("ignore_temperature", shelly_light_temperature, "temp_c"),
+)
+
+# (id(metrics table), id(ChannelConfig), label values) -> (config, emit plan) holding
+# only the metrics not disabled by the config's ignore flags. The entry holds the
+# config so its id cannot be reused while cached.
+_channel_plans: dict[
+    tuple[int, int, tuple[str, ...]], tuple[ChannelConfig, _EmitPlan]
+] = {}
+_CHANNEL_PLANS_MAX = 4096
+
+
+def _channel_plan(
+    table: tuple[tuple[str, Gauge, str], ...],
+    channel_config: ChannelConfig,
+    labels: tuple[str, ...],
+) -> _EmitPlan:
+    """Return the emit plan for one channel, built once per config and label values."""
+    key = (id(table), id(channel_config), labels)
+    cached = _channel_plans.get(key)
+    if cached is not None and cached[0] is channel_config:
+        return cached[1]
+
+    plan = tuple(
+        (_gauge_child(gauge, labels).set, attrgetter(field))
+        for flag, gauge, field in table
+        if not getattr(channel_config, flag)
+    )
+    if len(_channel_plans) >= _CHANNEL_PLANS_MAX:
+        _channel_plans.clear()
+        for keys in _device_cache_keys.values():
+            keys.difference_update([k for k in keys if k[0] == "channel"])
+    _channel_plans[key] = (channel_config, plan)
+    _track_cache_key(labels[0], "channel", key)
+    return plan
+
+
+def _set_channel_values(
+    table: tuple[tuple[str, Gauge, str], ...],
+    channel_config: ChannelConfig | None,
+    labels: tuple[str, ...],
+    reading: ChannelReading,
+) -> None:
+    """Set every enabled metric in table from reading."""
+    _emit(_channel_plan(table, channel_config or ChannelConfig.build(), labels), reading)
 
 
-def _update_switch_metrics(
+def _channel_labels(
     device_name: str,
     reading: ChannelReading,
     channel_config: ChannelConfig | None,
-) -> None:
-    """Update switch channel metrics."""
-    labels = {
-        "device": device_name,
-        "meter": str(reading.channel_index),
-        "label": channel_config.label if channel_config and channel_config.label else "",
-    }
-
-    # Check ignore flags from config
-    ignore = channel_config or ChannelConfig()
-
-    if not ignore.ignore_output:
-        _set_gauge_value(shelly_switch_output, labels, reading.output)
-
-    if not ignore.ignore_active_power:
-        _set_gauge_value(shelly_switch_apower, labels, reading.apower_w)
+) -> tuple[str, str, str]:
+    """Return channel label values in gauge order: device, meter/channel, label.
 
-    if not ignore.ignore_voltage:
-        _set_gauge_value(shelly_switch_voltage, labels, reading.voltage_v)
-
-    if not ignore.ignore_frequency:
-        _set_gauge_value(shelly_switch_frequency, labels, reading.freq_hz)
-
-    if not ignore.ignore_current:
-        _set_gauge_value(shelly_switch_current, labels, reading.current_a)
-
-    if not ignore.ignore_power_factor:
-        _set_gauge_value(shelly_switch_power_factor, labels, reading.pf)
-
-    if not ignore.ignore_temperature:
-        _set_gauge_value(shelly_switch_temperature, labels, reading.temp_c)
+    Every channel gauge always carries all three labels; an unconfigured label
+    is exported as "", which Prometheus treats the same as an absent label.
+    """
+    if channel_config is None:
+        return (device_name, str(reading.channel_index), "")
+    return (device_name, channel_config._index_str, channel_config.label or "")
 
-    if not ignore.ignore_total_active_energy:
-        _set_gauge_value(shelly_switch_aenergy, labels, reading.aenergy_wh)
 
-    if not ignore.ignore_total_returned_active_energy:
-        _set_gauge_value(shelly_switch_ret_aenergy, labels, reading.ret_aenergy_wh)
+def _update_switch_metrics(
+    device_name: str,
+    reading: ChannelReading,
+    channel_config: ChannelConfig | None,
+) -> None:
+    """Update switch channel metrics."""
+    # Only the metrics not disabled by ignore flags from config
+    labels = _channel_labels(device_name, reading, channel_config)
+    _set_channel_values(_SWITCH_METRICS, channel_config, labels, reading)
 
 
 def _update_light_metrics(
@@ -449,35 +590,9 @@ def _update_light_metrics(
     channel_config: ChannelConfig | None,
 ) -> None:
     """Update light channel metrics."""
-    labels = {
-        "device": device_name,
-        "channel": str(reading.channel_index),
-        "label": channel_config.label if channel_config and channel_config.label else "",
-    }
-
-    # Check ignore flags from config
-    ignore = channel_config or ChannelConfig()
-
-    if not ignore.ignore_output:
-        _set_gauge_value(shelly_light_output, labels, reading.output)
-
-    if not ignore.ignore_brightness:
-        _set_gauge_value(shelly_light_brightness, labels, reading.brightness)
-
-    if not ignore.ignore_active_power:
-        _set_gauge_value(shelly_light_apower, labels, reading.apower_w)
-
-    if not ignore.ignore_total_active_energy:
-        _set_gauge_value(shelly_light_aenergy, labels, reading.aenergy_wh)
-
-    if not ignore.ignore_voltage:
-        _set_gauge_value(shelly_light_voltage, labels, reading.voltage_v)
-
-    if not ignore.ignore_current:
-        _set_gauge_value(shelly_light_current, labels, reading.current_a)
-
-    if not ignore.ignore_temperature:
-        _set_gauge_value(shelly_light_temperature, labels, reading.temp_c)
+    # Only the metrics not disabled by ignore flags from config
+    labels = _channel_labels(device_name, reading, channel_config)
+    _set_channel_values(_LIGHT_METRICS, channel_config, labels, reading)
 
 
 def update_metrics_from_reading(
@@ -493,6 +608,10 @@ def update_metrics_from_reading(
     # Update device-level metrics
     update_device_metrics(reading)
 
+    # A failed poll carries nothing beyond the device-down state published above
+    if not reading.up:
+        return
+
     # Update system metrics
     if reading.system:
         update_system_metrics(reading.device_name, reading.system)
@@ -523,18 +642,36 @@ def update_metrics_from_reading(
         )
 
 
+def forget_device_metrics(device_name: str) -> None:
+    """Drop cached gauge children and emit plans for a device that is no longer polled.
+
+    Args:
+        device_name: Device identifier (the first label value of every cached entry)
+    """
+    caches: dict[str, dict[Any, Any]] = {
+        "child": _child_cache,
+        "emit": _emit_plans,
+        "channel": _channel_plans,
+    }
+    # Entries may already be gone (e.g. the channel plan cache was cleared)
+    for cache, key in _device_cache_keys.pop(device_name, ()):
+        caches[cache].pop(key, None)
+
+
 # =============================================================================
 # Discovery metrics update functions
 # =============================================================================
 def update_discovery_scan_started() -> None:
     """Record that a discovery scan has started."""
+    _mark_changed()
     shelly_discovery_scans_total.inc()
 
 
 def update_discovery_scan_completed(duration_seconds: float) -> None:
     """Record completion of a discovery scan."""
+    _mark_changed()
     shelly_discovery_scan_duration.set(duration_seconds)
-    shelly_discovery_last_scan_timestamp.set(time.time())
+    shelly_discovery_last_scan_timestamp.set(_time())
 
 
 def update_discovery_device_found(
@@ -546,6 +683,7 @@ def update_discovery_device_found(
     discovered_at: str,
 ) -> None:
     """Record a discovered device."""
+    _mark_changed()
     shelly_discovery_devices_found_total.inc()
     shelly_discovered_device_info.labels(
         ip=ip,
@@ -559,6 +697,7 @@ def update_discovery_device_found(
 
 def update_discovery_scan_error() -> None:
     """Record a scan error."""
+    _mark_changed()
     shelly_discovery_scan_errors.inc()
 
 
@@ -567,12 +706,14 @@ def update_discovery_scan_error() -> None:
 # =============================================================================
 def update_config_reload_success() -> None:
     """Record a successful config reload."""
+    _mark_changed()
     shelly_config_reloads_total.inc()
-    shelly_config_last_reload_timestamp.set(time.time())
+    shelly_config_last_reload_timestamp.set(_time())
     shelly_config_last_reload_status.set(1)
 
 
 def update_config_reload_error() -> None:
     """Record a failed config reload attempt."""
+    _mark_changed()
     shelly_config_reload_errors_total.inc()
     shelly_config_last_reload_status.set(0)
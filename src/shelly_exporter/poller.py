@@ -4,14 +4,18 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import time
+import random
 from dataclasses import dataclass, field
 from typing import Any
 
-from shelly_exporter.config import Config, TargetConfig
+from shelly_exporter.config import Config, Credentials, TargetConfig
 from shelly_exporter.drivers.base import DeviceDriver, DeviceReading
 from shelly_exporter.drivers.registry import get_registry
-from shelly_exporter.metrics import update_metrics_from_reading
+from shelly_exporter.metrics import (
+    forget_device_metrics,
+    update_metrics_from_reading,
+    update_poll_skipped,
+)
 from shelly_exporter.shelly_client import (
     ShellyAuthError,
     ShellyClient,
@@ -21,18 +25,90 @@ from shelly_exporter.shelly_client import (
 
 logger = logging.getLogger(__name__)
 
+# Poll intervals vary by up to this fraction either way, so targets do not synchronize
+_POLL_JITTER = 0.05
+
+# Longest backoff table; only reached when the multiplier never hits the cap (<= 1)
+_MAX_BACKOFF_STEPS = 64
+
+
+def _backoff_table(config: Config) -> tuple[float, ...]:
+    """Return backoff delays indexed by consecutive failures - 1, ending at the cap.
+
+    Args:
+        config: Configuration with backoff settings
+
+    Returns:
+        Tuple of backoff delays in seconds
+    """
+    base = config.backoff_base_seconds
+    multiplier = config.backoff_multiplier
+    cap = config.backoff_max_seconds
+    table: list[float] = []
+    for step in range(_MAX_BACKOFF_STEPS):
+        delay = min(base * multiplier**step, cap)
+        table.append(delay)
+        if delay == cap:
+            break
+    return tuple(table)
+
+
+class _AdmissionController:
+    """Concurrency limit that, unlike asyncio.Semaphore, can be resized at runtime."""
+
+    def __init__(self, max_concurrency: int) -> None:
+        self._cond = asyncio.Condition()
+        self._active = 0
+        self._max = max_concurrency
+
+    async def acquire(self) -> None:
+        """Wait until a slot is free, then take it."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._max)
+            self._active += 1
+
+    async def release(self) -> None:
+        """Free a slot and wake one waiter."""
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def resize(self, max_concurrency: int) -> None:
+        """Change the limit; running holders keep their slots."""
+        async with self._cond:
+            self._max = max_concurrency
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.release()
+
 
-@dataclass
+@dataclass(slots=True)
 class TargetState:
-    """Runtime state for a polling target."""
+    """Runtime state for a polling target.
+
+    Times are on the event loop's monotonic clock (loop.time()).
+    """
 
     target: TargetConfig
     driver: DeviceDriver | None = None
     device_info: dict[str, Any] = field(default_factory=dict)
     device_info_fetched_at: float = 0.0
+    # (gen, app, model, mac) of the device info the current driver was selected for
+    device_info_key: tuple[Any, ...] | None = None
     next_poll_time: float = 0.0
     consecutive_failures: int = 0
     backoff_until: float = 0.0
+    in_flight: bool = False  # True while a poll task for this target is running
+    # Effective settings, resolved once per config epoch
+    credentials: Credentials | None = None
+    poll_interval: int = 0
+    config_epoch: int = -1
+    # Client bound to the target's URL and credentials; rebuilt when they may change
+    client: ShellyClient | None = None
 
 
 class DevicePoller:
@@ -46,26 +122,37 @@ class DevicePoller:
         """
         self.config = config
         self._states: dict[str, TargetState] = {}
+        # Target URL -> name, kept in step with _states for O(1) has_target_url
+        self._url_index: dict[str, str] = {}
         self._client_pool: ShellyClientPool | None = None
-        self._semaphore: asyncio.Semaphore | None = None
+        self._admission: _AdmissionController | None = None
         self._running = False
+        # Set whenever scheduling changes, to wake the polling loop early
+        self._wakeup = asyncio.Event()
+        # Running poll tasks; each removes itself when done
+        self._inflight: set[asyncio.Task[None]] = set()
         self._registry = get_registry()
+        # Bumped by update_config so targets re-resolve their effective settings
+        self._config_epoch = 0
+        self._backoff_table = _backoff_table(config)
 
     async def start(self) -> None:
         """Start the poller."""
-        logger.info(f"Starting poller with {len(self.config.targets)} targets")
+        logger.info("Starting poller with %d targets", len(self.config.targets))
 
         # Initialize states for all targets
         for target in self.config.targets:
-            self._states[target.name] = TargetState(target=target)
+            self._states[target.name] = self._new_state(target)
+            self._url_index[target.url] = target.name
 
-        # Create semaphore for concurrency limiting
-        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        # Create admission controller for concurrency limiting
+        self._admission = _AdmissionController(self.config.max_concurrency)
 
         # Create client pool
         self._client_pool = ShellyClientPool(
             timeout=self.config.request_timeout_seconds,
             max_connections=self.config.max_concurrency * 2,
+            keepalive_expiry=max(300.0, self.config.poll_interval_seconds * 3.0),
         )
 
         self._running = True
@@ -78,28 +165,75 @@ class DevicePoller:
         """Stop the poller."""
         logger.info("Stopping poller")
         self._running = False
+        self._wakeup.set()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
         if self._client_pool:
             await self._client_pool.__aexit__(None, None, None)
             self._client_pool = None
 
     async def _polling_loop(self) -> None:
-        """Main polling loop."""
+        """Main polling loop.
+
+        Sleeps until the earliest target is due, using an event loop timer
+        that sets _wakeup. Adding, removing or rescheduling targets sets
+        _wakeup too, so the loop re-evaluates sooner.
+        Polls run as independent tasks, so a slow device never delays others;
+        a target is not scheduled again while its previous poll is in flight.
+        """
+        wakeup = self._wakeup
+        inflight = self._inflight
+        loop = asyncio.get_running_loop()
+        clock = loop.time
         while self._running:
-            now = time.time()
-            tasks: list[asyncio.Task[None]] = []
+            # Clear before scanning so changes made while waiting are not missed
+            wakeup.clear()
+            now = clock()
+            next_wake: float | None = None
 
-            # Find targets due for polling
+            # Start targets due for polling, and find the earliest time one becomes due
             for state in self._states.values():
-                if now >= state.next_poll_time and now >= state.backoff_until:
-                    task = asyncio.create_task(self._poll_target(state))
-                    tasks.append(task)
+                if state.in_flight:
+                    continue
+                due = max(state.next_poll_time, state.backoff_until)
+                if now >= due:
+                    state.in_flight = True
+                    task = asyncio.create_task(self._run_poll(state))
+                    inflight.add(task)
+                    task.add_done_callback(inflight.discard)
+                elif next_wake is None or due < next_wake:
+                    next_wake = due
+
+            # Arm a loop timer for the earliest due time instead of wrapping the wait
+            timer = None if next_wake is None else loop.call_at(next_wake, wakeup.set)
+            try:
+                await wakeup.wait()
+            finally:
+                if timer is not None:
+                    timer.cancel()
 
-            # Wait for batch to complete (if any)
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+    async def _run_poll(self, state: TargetState) -> None:
+        """Poll a target as a detached task, clearing its in-flight flag when done.
 
-            # Sleep briefly before next check
-            await asyncio.sleep(0.1)
+        A poll that outlasts the target's interval means the loop skipped the
+        ticks in between; those are logged and counted.
+        """
+        clock = asyncio.get_running_loop().time
+        started = clock()
+        try:
+            await self._poll_target(state)
+        finally:
+            state.in_flight = False
+            self._wakeup.set()
+            if state.poll_interval > 0 and self._is_current(state):
+                skipped = int((clock() - started) // state.poll_interval)
+                if skipped:
+                    logger.debug(
+                        "Target '%s' was still polling, skipped %d scheduled polls",
+                        state.target.name,
+                        skipped,
+                    )
+                    update_poll_skipped(state.target.name, skipped)
 
     async def _poll_target(self, state: TargetState) -> None:
         """Poll a single target.
@@ -107,42 +241,46 @@ class DevicePoller:
         Args:
             state: Target state to poll
         """
-        if not self._semaphore or not self._client_pool:
+        if not self._admission or not self._client_pool:
             return
 
-        async with self._semaphore:
+        clock = asyncio.get_running_loop().time
+        async with self._admission:
             target = state.target
-            start_time = time.time()
+            start_time = now = clock()
 
             try:
-                # Get credentials
-                credentials = self.config.get_target_credentials(target)
-
-                # Create client for this target
-                client = self._client_pool.get_client(target.url, credentials)
+                # Client for this target, created on first poll and after config changes
+                self._refresh_target_settings(state)
+                client = state.client
+                if client is None:
+                    client = state.client = self._client_pool.get_client(
+                        target.url, state.credentials
+                    )
 
                 # Fetch device info if needed (first time or refresh interval)
-                if await self._should_refresh_device_info(state):
+                if self._should_refresh_device_info(state, start_time):
                     await self._fetch_device_info(client, state)
 
-                # Skip if no driver available
+                # Skip if no driver available (rescheduled in finally)
                 if not state.driver:
-                    logger.warning(f"No driver for target '{target.name}', skipping poll")
-                    self._schedule_next_poll(state)
+                    logger.warning("No driver for target '%s', skipping poll", target.name)
+                    now = clock()
                     return
 
                 # Fetch status
                 status = await client.get_status()
-                duration = time.time() - start_time
-
-                # Parse status into readings
-                channel_readings = state.driver.parse_status(status, target)
-
-                # Parse additional data (system, wifi, connection, inputs)
-                system_reading = state.driver.parse_system(status)
-                wifi_reading = state.driver.parse_wifi(status)
-                connection_reading = state.driver.parse_connection_status(status)
-                input_readings = state.driver.parse_inputs(status)
+                now = clock()
+                duration = now - start_time
+
+                # Parse status into channel, input, system, wifi and connection readings
+                (
+                    channel_readings,
+                    input_readings,
+                    system_reading,
+                    wifi_reading,
+                    connection_reading,
+                ) = state.driver.parse_all(status, target)
 
                 # Create device reading
                 reading = DeviceReading(
@@ -156,40 +294,56 @@ class DevicePoller:
                     connection=connection_reading,
                 )
 
-                # Update metrics
-                update_metrics_from_reading(reading, target)
+                # Update metrics, unless the target was removed while this poll ran
+                if self._is_current(state):
+                    update_metrics_from_reading(reading, target)
 
                 # Reset failure count on success
                 state.consecutive_failures = 0
                 state.backoff_until = 0.0
 
                 logger.debug(
-                    f"Polled '{target.name}' successfully in {duration:.3f}s, "
-                    f"{len(channel_readings)} channels"
+                    "Polled '%s' successfully in %.3fs, %d channels",
+                    target.name,
+                    duration,
+                    len(channel_readings),
                 )
 
             except ShellyAuthError as e:
-                duration = time.time() - start_time
-                self._handle_poll_error(state, str(e), duration)
-                logger.warning(f"Auth error for '{target.name}': {e}")
+                now = clock()
+                self._handle_poll_error(state, str(e), now - start_time, now)
+                logger.warning("Auth error for '%s': %s", target.name, e)
 
             except ShellyClientError as e:
-                duration = time.time() - start_time
-                self._handle_poll_error(state, str(e), duration)
-                logger.warning(f"Client error for '{target.name}': {e}")
+                now = clock()
+                self._handle_poll_error(state, str(e), now - start_time, now)
+                logger.warning("Client error for '%s': %s", target.name, e)
+
+            except (TimeoutError, OSError) as e:
+                # Transient network failures that escaped the client's own wrapping
+                now = clock()
+                self._handle_poll_error(state, str(e), now - start_time, now)
+                logger.warning("Transient error polling '%s': %s", target.name, e)
 
             except Exception as e:
-                duration = time.time() - start_time
-                self._handle_poll_error(state, str(e), duration)
-                logger.exception(f"Unexpected error polling '{target.name}'")
+                now = clock()
+                self._handle_poll_error(state, str(e), now - start_time, now)
+                # Full traceback on the first and every 10th consecutive failure only
+                if state.consecutive_failures % 10 == 1:
+                    logger.exception("Unexpected error polling '%s'", target.name)
+                else:
+                    logger.warning(
+                        "Unexpected error polling '%s' (%d consecutive failures): %s",
+                        target.name,
+                        state.consecutive_failures,
+                        e,
+                    )
 
             finally:
-                self._schedule_next_poll(state)
+                self._schedule_next_poll(state, now)
 
-    async def _should_refresh_device_info(self, state: TargetState) -> bool:
+    def _should_refresh_device_info(self, state: TargetState, now: float) -> bool:
         """Check if device info should be refreshed."""
-        now = time.time()
-
         # First fetch
         if state.device_info_fetched_at == 0:
             return True
@@ -218,34 +372,51 @@ class DevicePoller:
         try:
             device_info = await client.get_device_info()
             state.device_info = device_info
-            state.device_info_fetched_at = time.time()
+            state.device_info_fetched_at = asyncio.get_running_loop().time()
+
+            # Same device as last time: keep the driver, skip selection and logging
+            key = (
+                device_info.get("gen"),
+                device_info.get("app"),
+                device_info.get("model"),
+                device_info.get("mac"),
+            )
+            if key == state.device_info_key and state.driver is not None:
+                return
+            state.device_info_key = key
 
             # Select best driver
             driver = self._registry.get_best_driver(device_info)
             if driver:
                 state.driver = driver
                 logger.info(
-                    f"Target '{state.target.name}': selected driver "
-                    f"'{driver.driver_name}' for gen={device_info.get('gen')}, "
-                    f"app={device_info.get('app')}"
+                    "Target '%s': selected driver '%s' for gen=%s, app=%s",
+                    state.target.name,
+                    driver.driver_name,
+                    device_info.get("gen"),
+                    device_info.get("app"),
                 )
             else:
                 state.driver = None
                 logger.warning(
-                    f"Target '{state.target.name}': no driver for "
-                    f"gen={device_info.get('gen')}, app={device_info.get('app')}"
+                    "Target '%s': no driver for gen=%s, app=%s",
+                    state.target.name,
+                    device_info.get("gen"),
+                    device_info.get("app"),
                 )
 
         except ShellyClientError as e:
-            logger.error(f"Failed to fetch device info for '{state.target.name}': {e}")
+            logger.error("Failed to fetch device info for '%s': %s", state.target.name, e)
             # Keep existing driver if any
-            state.device_info_fetched_at = time.time()  # Prevent immediate retry
+            # Prevent immediate retry
+            state.device_info_fetched_at = asyncio.get_running_loop().time()
 
     def _handle_poll_error(
         self,
         state: TargetState,
         error_message: str,
         duration: float,
+        now: float,
     ) -> None:
         """Handle a poll error with backoff.
 
@@ -253,16 +424,18 @@ class DevicePoller:
             state: Target state
             error_message: Error description
             duration: Poll duration in seconds
+            now: Current event loop time
         """
         state.consecutive_failures += 1
 
-        # Calculate backoff
-        backoff = min(
-            self.config.backoff_base_seconds
-            * (self.config.backoff_multiplier ** (state.consecutive_failures - 1)),
-            self.config.backoff_max_seconds,
-        )
-        state.backoff_until = time.time() + backoff
+        # Look up backoff; failures past the end of the table stay at its last delay
+        table = self._backoff_table
+        backoff = table[min(state.consecutive_failures, len(table)) - 1]
+        state.backoff_until = now + backoff
+
+        # Target removed while this poll ran; its metrics were already forgotten
+        if not self._is_current(state):
+            return
 
         # Create error reading for metrics
         reading = DeviceReading(
@@ -274,18 +447,55 @@ class DevicePoller:
         update_metrics_from_reading(reading, state.target)
 
         logger.debug(
-            f"Target '{state.target.name}' failed ({state.consecutive_failures} consecutive), "
-            f"backing off for {backoff:.1f}s"
+            "Target '%s' failed (%d consecutive), backing off for %.1fs",
+            state.target.name,
+            state.consecutive_failures,
+            backoff,
         )
 
-    def _schedule_next_poll(self, state: TargetState) -> None:
-        """Schedule next poll time for target.
+    def _refresh_target_settings(self, state: TargetState) -> None:
+        """Resolve the target's effective settings if the config changed since last time.
 
         Args:
             state: Target state to update
         """
-        interval = self.config.get_target_poll_interval(state.target)
-        state.next_poll_time = time.time() + interval
+        if state.config_epoch != self._config_epoch:
+            state.credentials = self.config.get_target_credentials(state.target)
+            state.poll_interval = self.config.get_target_poll_interval(state.target)
+            state.config_epoch = self._config_epoch
+            # URL or credentials may have changed; rebind on next poll
+            state.client = None
+
+    def _new_state(self, target: TargetConfig) -> TargetState:
+        """Create state for a new target, with its first poll at a random point in one interval.
+
+        Spreading first polls keeps targets loaded together from polling in lockstep.
+
+        Args:
+            target: Target configuration
+
+        Returns:
+            New target state
+        """
+        state = TargetState(target=target)
+        self._refresh_target_settings(state)
+        state.next_poll_time = (
+            asyncio.get_running_loop().time() + random.random() * state.poll_interval
+        )
+        return state
+
+    def _schedule_next_poll(self, state: TargetState, now: float) -> None:
+        """Schedule next poll time for target, with a small random jitter.
+
+        Args:
+            state: Target state to update
+            now: Current event loop time
+        """
+        self._refresh_target_settings(state)
+        interval = state.poll_interval
+        jitter = interval * _POLL_JITTER * (random.random() * 2 - 1)
+        state.next_poll_time = now + interval + jitter
+        self._wakeup.set()
 
     async def add_target(self, target: TargetConfig) -> None:
         """Add a new target to the poller dynamically.
@@ -294,12 +504,14 @@ class DevicePoller:
             target: Target configuration to add
         """
         if target.name in self._states:
-            logger.warning(f"Target '{target.name}' already exists, skipping")
+            logger.warning("Target '%s' already exists, skipping", target.name)
             return
 
-        self._states[target.name] = TargetState(target=target)
+        self._states[target.name] = self._new_state(target)
+        self._url_index[target.url] = target.name
         self.config.targets.append(target)
-        logger.info(f"Added new target '{target.name}' to poller")
+        self._wakeup.set()
+        logger.info("Added new target '%s' to poller", target.name)
 
     def has_target(self, name: str) -> bool:
         """Check if a target exists by name.
@@ -321,10 +533,7 @@ class DevicePoller:
         Returns:
             True if target with URL exists
         """
-        for state in self._states.values():
-            if state.target.url == url:
-                return True
-        return False
+        return url in self._url_index
 
     async def remove_target(self, name: str) -> bool:
         """Remove a target from the poller.
@@ -335,52 +544,93 @@ class DevicePoller:
         Returns:
             True if target was removed, False if not found
         """
-        if name not in self._states:
+        if not self._drop_state(name):
             return False
 
-        del self._states[name]
         # Also remove from config.targets list
         self.config.targets = [t for t in self.config.targets if t.name != name]
-        logger.info(f"Removed target '{name}' from poller")
+        self._wakeup.set()
+        logger.info("Removed target '%s' from poller", name)
+        return True
+
+    def _is_current(self, state: TargetState) -> bool:
+        """Check that state still belongs to a polled target.
+
+        A poll in flight when its target is removed must not recreate the
+        metrics and caches that removal just dropped.
+        """
+        return self._states.get(state.target.name) is state
+
+    def _drop_state(self, name: str) -> bool:
+        """Forget a target's runtime state, URL index entry and cached metrics.
+
+        Args:
+            name: Target name to drop
+
+        Returns:
+            True if the target existed
+        """
+        state = self._states.pop(name, None)
+        if state is None:
+            return False
+
+        if self._url_index.get(state.target.url) == name:
+            del self._url_index[state.target.url]
+        forget_device_metrics(name)
         return True
 
     async def update_config(self, new_config: Config) -> None:
         """Update poller with new configuration.
 
         Handles adding new targets, removing old targets, and updating settings.
+        All lookups go through one name -> target dict, so a reload is linear
+        in the number of targets.
 
         Args:
             new_config: New configuration to apply
         """
-        old_target_names = set(self._states.keys())
-        new_target_names = {t.name for t in new_config.targets}
+        new_by_name = {t.name: t for t in new_config.targets}
+        states = self._states
 
         # Find targets to add and remove
-        to_add = new_target_names - old_target_names
-        to_remove = old_target_names - new_target_names
+        to_add = [name for name in new_by_name if name not in states]
+        to_remove = [name for name in states if name not in new_by_name]
 
-        # Remove old targets
+        # Re-read of an identical config: keep everything as is
+        if not to_add and not to_remove and new_config == self.config:
+            logger.debug("Config unchanged, nothing to update")
+            return
+
+        # Remove old targets; the old config's target list is replaced below
         for name in to_remove:
-            await self.remove_target(name)
+            self._drop_state(name)
+            logger.info("Removed target '%s' from poller", name)
 
         # Update the config reference
         self.config = new_config
+        self._config_epoch += 1
+        self._backoff_table = _backoff_table(new_config)
+        if self._admission:
+            await self._admission.resize(new_config.max_concurrency)
+
+        # Add new targets and update existing ones with new config values
+        for name, target in new_by_name.items():
+            state = states.get(name)
+            if state is None:
+                states[name] = self._new_state(target)
+                logger.info("Added new target '%s' from config reload", name)
+            else:
+                state.target = target
 
-        # Add new targets
-        for target in new_config.targets:
-            if target.name in to_add:
-                self._states[target.name] = TargetState(target=target)
-                logger.info(f"Added new target '{target.name}' from config reload")
+        # URLs of kept targets may have changed
+        self._url_index = {state.target.url: name for name, state in self._states.items()}
 
-        # Update existing targets with new config values
-        for name in old_target_names & new_target_names:
-            # Find the updated target config
-            for target in new_config.targets:
-                if target.name == name:
-                    self._states[name].target = target
-                    break
+        # Poll intervals may have changed
+        self._wakeup.set()
 
         logger.info(
-            f"Config update complete: added {len(to_add)}, removed {len(to_remove)}, "
-            f"total targets: {len(self._states)}"
+            "Config update complete: added %d, removed %d, total targets: %d",
+            len(to_add),
+            len(to_remove),
+            len(self._states),
         )
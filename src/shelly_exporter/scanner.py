@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import ipaddress
+import json
 import logging
 import re
 import time
@@ -18,7 +21,6 @@ import yaml
 from shelly_exporter.config import (
     ChannelConfig,
     Config,
-    Credentials,
     DiscoveryConfig,
     TargetConfig,
 )
@@ -29,9 +31,25 @@ from shelly_exporter.metrics import (
     update_discovery_scan_error,
     update_discovery_scan_started,
 )
+from shelly_exporter.shelly_client import basic_auth, decode_json, encode_json
+
+try:
+    # libyaml-backed loader and dumper, much faster than the pure-Python ones
+    from yaml import CSafeDumper as _SafeDumper
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _SafeDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+_RANGE_RE = re.compile(r"^(\d+\.\d+\.\d+\.\d+)-(\d+\.\d+\.\d+\.\d+)$")
+_SANITIZE_RE = re.compile(r"[^a-zA-Z0-9_-]")
+
+# Every probe sends the same request, so encode it once
+_PROBE_BODY = encode_json({"id": 1, "method": "Shelly.GetDeviceInfo"})
+_PROBE_HEADERS = {"content-type": "application/json"}
+
 
 @dataclass
 class DiscoveredDevice:
@@ -76,42 +94,52 @@ def parse_network_range(range_str: str) -> list[str]:
     Returns:
         List of IP addresses as strings
     """
-    range_str = range_str.strip()
+    return [_int_to_ip(n) for n in _parse_network_range(range_str.strip())]
+
+
+def _int_to_ip(n: int) -> str:
+    """Format an integer IPv4 address as a dotted-quad string."""
+    return f"{(n >> 24) & 0xFF}.{(n >> 16) & 0xFF}.{(n >> 8) & 0xFF}.{n & 0xFF}"
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_network_range(range_str: str) -> range:
+    """Parse a stripped network range string into a range of integer addresses.
 
+    A range holds only its bounds, so large networks cost no memory until
+    iterated, and caching is cheap as ranges rarely change between scans.
+    """
     # Check for IP range notation (e.g., "192.168.1.100-192.168.1.200")
-    range_match = re.match(
-        r"^(\d+\.\d+\.\d+\.\d+)-(\d+\.\d+\.\d+\.\d+)$", range_str
-    )
+    range_match = _RANGE_RE.match(range_str)
     if range_match:
-        start_ip = ipaddress.IPv4Address(range_match.group(1))
-        end_ip = ipaddress.IPv4Address(range_match.group(2))
+        start_ip = int(ipaddress.IPv4Address(range_match.group(1)))
+        end_ip = int(ipaddress.IPv4Address(range_match.group(2)))
         if start_ip > end_ip:
             start_ip, end_ip = end_ip, start_ip
-        return [
-            str(ipaddress.IPv4Address(ip))
-            for ip in range(int(start_ip), int(end_ip) + 1)
-        ]
+        return range(start_ip, end_ip + 1)
 
     # Check for CIDR notation
     if "/" in range_str:
         try:
             network = ipaddress.IPv4Network(range_str, strict=False)
+            first = int(network.network_address)
+            last = first + network.num_addresses - 1
             # Exclude network and broadcast addresses for /24 and larger
             if network.prefixlen <= 30:
-                return [str(ip) for ip in network.hosts()]
+                return range(first + 1, last)
             else:
-                return [str(ip) for ip in network]
+                return range(first, last + 1)
         except ValueError as e:
             logger.warning(f"Invalid CIDR notation '{range_str}': {e}")
-            return []
+            return range(0)
 
     # Single IP address
     try:
-        ipaddress.IPv4Address(range_str)
-        return [range_str]
+        address = int(ipaddress.IPv4Address(range_str))
+        return range(address, address + 1)
     except ValueError as e:
         logger.warning(f"Invalid IP address '{range_str}': {e}")
-        return []
+        return range(0)
 
 
 def generate_ip_list(
@@ -126,17 +154,19 @@ def generate_ip_list(
     Returns:
         List of IP addresses to scan
     """
-    all_ips: set[str] = set()
-    exclude_set = set(exclude_ips)
-
+    # Collect addresses as integers so deduplication and sorting need no string parsing
+    all_ips: set[int] = set()
     for range_str in network_ranges:
-        ips = parse_network_range(range_str)
-        all_ips.update(ips)
+        all_ips.update(_parse_network_range(range_str.strip()))
 
-    # Remove excluded IPs
-    all_ips -= exclude_set
+    # Remove excluded IPs; entries that are not addresses cannot match anything
+    for ip in exclude_ips:
+        try:
+            all_ips.discard(int(ipaddress.IPv4Address(ip.strip())))
+        except ValueError:
+            logger.warning(f"Ignoring invalid excluded IP '{ip}'")
 
-    return sorted(all_ips, key=lambda ip: tuple(int(x) for x in ip.split(".")))
+    return [_int_to_ip(n) for n in sorted(all_ips)]
 
 
 def format_device_name(template: str, device: DiscoveredDevice) -> str:
@@ -159,7 +189,7 @@ def format_device_name(template: str, device: DiscoveredDevice) -> str:
     """
     # Sanitize values for use in names (replace special chars)
     def sanitize(value: str) -> str:
-        return re.sub(r"[^a-zA-Z0-9_-]", "_", str(value).lower())
+        return _SANITIZE_RE.sub("_", str(value).lower())
 
     return template.format(
         ip=device.ip.replace(".", "_"),
@@ -171,8 +201,15 @@ def format_device_name(template: str, device: DiscoveredDevice) -> str:
     )
 
 
+def _is_json_path(path: Path) -> bool:
+    """Return True if the discovered devices file should be stored as JSON."""
+    return path.suffix.lower() == ".json"
+
+
 def load_discovered_devices(persist_path: str | Path) -> list[TargetConfig]:
-    """Load previously discovered devices from YAML file.
+    """Load previously discovered devices from a YAML or JSON file.
+
+    A ``.json`` suffix selects JSON; any other path is read as YAML.
 
     Args:
         persist_path: Path to the discovered devices file
@@ -186,8 +223,11 @@ def load_discovered_devices(persist_path: str | Path) -> list[TargetConfig]:
         return []
 
     try:
-        with open(path) as f:
-            data = yaml.safe_load(f)
+        raw = path.read_bytes()
+        if _is_json_path(path):
+            data = json.loads(raw) if raw.strip() else None
+        else:
+            data = yaml.load(raw, Loader=_SafeLoader)
 
         if not data or "discovered_targets" not in data:
             return []
@@ -195,8 +235,8 @@ def load_discovered_devices(persist_path: str | Path) -> list[TargetConfig]:
         targets = []
         for target_data in data["discovered_targets"]:
             try:
-                target = TargetConfig.model_validate(target_data)
-                target.discovered = True  # Ensure flag is set
+                # Ensure flag is set; targets are immutable once validated
+                target = TargetConfig.model_validate({**target_data, "discovered": True})
                 targets.append(target)
             except Exception as e:
                 logger.warning(f"Failed to load discovered target: {e}")
@@ -212,7 +252,10 @@ def load_discovered_devices(persist_path: str | Path) -> list[TargetConfig]:
 def save_discovered_devices(
     persist_path: str | Path, targets: list[TargetConfig]
 ) -> None:
-    """Save discovered devices to YAML file.
+    """Save discovered devices to a YAML or JSON file.
+
+    A ``.json`` suffix writes compact JSON, which is much faster to write and
+    read back than YAML; any other path is written as commented YAML.
 
     Args:
         persist_path: Path to save the discovered devices file
@@ -224,9 +267,7 @@ def save_discovered_devices(
     discovered = [t for t in targets if t.discovered]
 
     # Convert to serializable format
-    data = {
-        "# Auto-generated file - discovered Shelly devices": None,
-        "# Do not edit manually - changes may be overwritten": None,
+    payload = {
         "discovered_targets": [
             {
                 "name": t.name,
@@ -257,15 +298,20 @@ def save_discovered_devices(
         path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(path, "w") as f:
-            # Write header comments
-            f.write("# Auto-generated file - discovered Shelly devices\n")
-            f.write("# Do not edit manually - changes may be overwritten\n\n")
-            yaml.dump(
-                {"discovered_targets": data["discovered_targets"]},
-                f,
-                default_flow_style=False,
-                sort_keys=False,
-            )
+            if _is_json_path(path):
+                # JSON has no comments; the schema is the same as the YAML file
+                json.dump(payload, f, separators=(",", ":"))
+            else:
+                # Write header comments
+                f.write("# Auto-generated file - discovered Shelly devices\n")
+                f.write("# Do not edit manually - changes may be overwritten\n\n")
+                yaml.dump(
+                    payload,
+                    f,
+                    Dumper=_SafeDumper,
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
 
         logger.info(f"Saved {len(discovered)} discovered devices to {path}")
 
@@ -300,22 +346,24 @@ class NetworkScanner:
         self._discovered_targets: list[TargetConfig] = []
         self._running = False
         self._scan_task: asyncio.Task[None] | None = None
+        # Shared by all scans while the service runs, so connections are reused
+        self._http_client: httpx.AsyncClient | None = None
 
         # Build set of already-configured target IPs/URLs for deduplication
-        self._configured_urls: set[str] = self._get_configured_urls()
+        self._configured_urls: frozenset[str] = self._get_configured_urls()
 
-    def _get_configured_urls(self) -> set[str]:
+    def _get_configured_urls(self) -> frozenset[str]:
         """Get set of URLs/IPs from all targets in the config file.
 
         All targets in config.yml are considered "configured" for deduplication,
         regardless of whether they were originally discovered or manually added.
+        URLs are normalized once here so lookups compare bare IPs directly.
         """
-        urls = set()
-        for target in self.config.targets:
-            # Normalize URL to just the IP/hostname
-            url = target.url.replace("http://", "").replace("https://", "").rstrip("/")
-            urls.add(url)
-        return urls
+        # Normalize URL to just the IP/hostname
+        return frozenset(
+            target.url.removeprefix("http://").removeprefix("https://").rstrip("/")
+            for target in self.config.targets
+        )
 
     def _is_already_configured(self, ip: str) -> bool:
         """Check if an IP is already in the configured targets."""
@@ -326,34 +374,52 @@ class NetworkScanner:
         """Return dictionary of discovered devices by IP."""
         return self._discovered_devices.copy()
 
+    async def _tcp_alive(self, ip: str) -> bool:
+        """Check whether a host accepts TCP connections on the HTTP port.
+
+        Most addresses in a scanned range have no host, so this cheap connect
+        with a short timeout filters them out before a full HTTP probe.
+
+        Args:
+            ip: IP address to check
+
+        Returns:
+            True if the connection was accepted or the check is disabled
+        """
+        timeout = self.discovery_config.tcp_probe_timeout
+        if timeout <= 0:
+            return True
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, 80), timeout)
+        except (TimeoutError, OSError):
+            return False
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+        return True
+
     async def _probe_ip(
         self,
         ip: str,
         client: httpx.AsyncClient,
-        credentials: Credentials | None,
+        auth: httpx.BasicAuth | None,
     ) -> DiscoveredDevice | None:
         """Probe a single IP address for a Shelly device.
 
         Args:
             ip: IP address to probe
             client: HTTP client
-            credentials: Optional credentials
+            auth: Optional HTTP auth, shared by every probe in a scan
 
         Returns:
             DiscoveredDevice if found, None otherwise
         """
         url = f"http://{ip}/rpc"
-        payload = {"id": 1, "method": "Shelly.GetDeviceInfo"}
-
-        auth = None
-        if credentials and credentials.has_credentials():
-            auth = httpx.BasicAuth(
-                username=credentials.username,
-                password=credentials.password,
-            )
 
         try:
-            response = await client.post(url, json=payload, auth=auth)
+            response = await client.post(
+                url, content=_PROBE_BODY, headers=_PROBE_HEADERS, auth=auth
+            )
 
             if response.status_code in (401, 403):
                 logger.debug(f"Auth required for {ip}")
@@ -362,7 +428,7 @@ class NetworkScanner:
             if response.status_code != 200:
                 return None
 
-            data = response.json()
+            data = decode_json(response.content)
             if "result" not in data:
                 return None
 
@@ -412,44 +478,38 @@ class NetworkScanner:
 
         logger.info(f"Starting network scan of {len(ips_to_scan)} IP addresses")
 
-        credentials = self.config.get_discovery_credentials()
-        semaphore = asyncio.Semaphore(self.discovery_config.scan_concurrency)
+        # Encode the credentials once for all probes
+        auth = basic_auth(self.config.get_discovery_credentials())
         new_devices: list[DiscoveredDevice] = []
 
-        async with httpx.AsyncClient(
-            timeout=self.discovery_config.scan_timeout_seconds
-        ) as client:
-
-            async def probe_with_semaphore(ip: str) -> DiscoveredDevice | None:
-                async with semaphore:
-                    return await self._probe_ip(ip, client, credentials)
-
-            tasks = [probe_with_semaphore(ip) for ip in ips_to_scan]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for result in results:
-                if isinstance(result, Exception):
-                    update_discovery_scan_error()
-                    continue
-                if result is not None:
-                    device = result
-                    # Skip if already in configured targets or already discovered
-                    if self._is_already_configured(device.ip):
-                        logger.debug(f"Skipping {device.ip} - already in configured targets")
+        # Outside the running service (a one-off scan), use a client for this scan only
+        client_context = (
+            contextlib.nullcontext(self._http_client)
+            if self._http_client is not None
+            else self._new_http_client()
+        )
+        async with client_context as client:
+            # A fixed pool of workers shares one iterator, so memory stays bounded by the
+            # concurrency rather than the number of IPs, and results are handled as they
+            # arrive instead of after the whole scan
+            pending = iter(ips_to_scan)
+
+            async def worker() -> None:
+                for ip in pending:
+                    # One failing address must not stop this worker's share of the scan
+                    try:
+                        if not await self._tcp_alive(ip):
+                            continue
+                        device = await self._probe_ip(ip, client, auth)
+                    except Exception:
+                        logger.debug(f"Unexpected error scanning {ip}", exc_info=True)
+                        update_discovery_scan_error()
                         continue
-                    if device.ip not in self._discovered_devices:
-                        new_devices.append(device)
-                        self._discovered_devices[device.ip] = device
-
-                        # Update metrics
-                        update_discovery_device_found(
-                            ip=device.ip,
-                            model=device.model,
-                            gen=device.gen,
-                            app=device.app,
-                            mac=device.mac,
-                            discovered_at=device.discovered_at.isoformat(),
-                        )
+                    if device is not None:
+                        self._record_discovered_device(device, new_devices)
+
+            workers = min(self.discovery_config.scan_concurrency, len(ips_to_scan))
+            await asyncio.gather(*(worker() for _ in range(workers)))
 
         duration = time.time() - start_time
         update_discovery_scan_completed(duration)
@@ -461,6 +521,52 @@ class NetworkScanner:
 
         return new_devices
 
+    def _new_http_client(self) -> httpx.AsyncClient:
+        """Create the HTTP client used to probe devices.
+
+        Returns:
+            Client sized for the scan concurrency, keeping connections to
+            responding devices alive between scans
+        """
+        concurrency = self.discovery_config.scan_concurrency
+        return httpx.AsyncClient(
+            timeout=self.discovery_config.scan_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+                keepalive_expiry=max(300.0, self.discovery_config.scan_interval_seconds * 2.0),
+            ),
+        )
+
+    def _record_discovered_device(
+        self, device: DiscoveredDevice, new_devices: list[DiscoveredDevice]
+    ) -> None:
+        """Track a device found by a scan unless it is already known.
+
+        Args:
+            device: Device that answered a probe
+            new_devices: List of devices new in this scan, appended to
+        """
+        # Skip if already in configured targets or already discovered
+        if self._is_already_configured(device.ip):
+            logger.debug(f"Skipping {device.ip} - already in configured targets")
+            return
+        if device.ip in self._discovered_devices:
+            return
+
+        new_devices.append(device)
+        self._discovered_devices[device.ip] = device
+
+        # Update metrics
+        update_discovery_device_found(
+            ip=device.ip,
+            model=device.model,
+            gen=device.gen,
+            app=device.app,
+            mac=device.mac,
+            discovered_at=device.discovered_at.isoformat(),
+        )
+
     def create_target_for_device(
         self, device: DiscoveredDevice
     ) -> TargetConfig | None:
@@ -489,7 +595,7 @@ class NetworkScanner:
         for channel_type, indices in supported.items():
             for index in sorted(indices):
                 channels.append(
-                    ChannelConfig(type=channel_type, index=index)
+                    ChannelConfig.build(type=channel_type, index=index)
                 )
 
         # Note: Gateway devices (BluGw, etc.) may have no channels but are still
@@ -558,6 +664,7 @@ class NetworkScanner:
             await self._load_persisted_devices()
 
         self._running = True
+        self._http_client = self._new_http_client()
         self._scan_task = asyncio.create_task(self._scan_loop())
         logger.info(
             f"Started network scanner, interval={self.discovery_config.scan_interval_seconds}s"
@@ -597,6 +704,9 @@ class NetworkScanner:
             except asyncio.CancelledError:
                 pass
             self._scan_task = None
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
         logger.info("Stopped network scanner")
 
     async def _scan_loop(self) -> None:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from typing import Any
 
@@ -9,6 +10,43 @@ import httpx
 
 from shelly_exporter.config import Credentials
 
+try:
+    from orjson import dumps as _orjson_dumps
+    from orjson import loads as _orjson_loads
+
+    _HAS_ORJSON = True
+except ImportError:  # pragma: no cover - optional dependency
+    _HAS_ORJSON = False
+
+__all__ = [
+    "ShellyAuthError",
+    "ShellyClient",
+    "ShellyClientError",
+    "ShellyClientPool",
+    "ShellyTimeoutError",
+    "basic_auth",
+    "decode_json",
+    "encode_json",
+]
+
+
+def decode_json(data: bytes) -> Any:
+    """Decode a JSON document, using orjson when it is installed."""
+    if _HAS_ORJSON:
+        return _orjson_loads(data)
+    return json.loads(data)
+
+
+def encode_json(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON, using orjson when it is installed."""
+    if _HAS_ORJSON:
+        encoded: bytes = _orjson_dumps(obj)
+        return encoded
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +68,20 @@ class ShellyTimeoutError(ShellyClientError):
     pass
 
 
+def basic_auth(credentials: Credentials | None) -> httpx.BasicAuth | None:
+    """Build HTTP Basic Auth for credentials, or None if none are configured.
+
+    The auth header is encoded once here, so callers should build it once per
+    set of credentials and reuse it for every request.
+    """
+    if credentials and credentials.has_credentials():
+        return httpx.BasicAuth(
+            username=credentials.username,
+            password=credentials.password,
+        )
+    return None
+
+
 class ShellyClient:
     """Async HTTP client for Shelly devices using JSON-RPC API.
 
@@ -56,6 +108,7 @@ class ShellyClient:
             base_url = f"http://{base_url}"
         self.base_url = base_url.rstrip("/")
         self.credentials = credentials
+        self._auth = basic_auth(credentials)
         self.timeout = timeout
         self._client = client
         self._owns_client = client is None
@@ -73,12 +126,7 @@ class ShellyClient:
 
     def _get_auth(self) -> httpx.BasicAuth | None:
         """Get HTTP Basic Auth if credentials are configured."""
-        if self.credentials and self.credentials.has_credentials():
-            return httpx.BasicAuth(
-                username=self.credentials.username,
-                password=self.credentials.password,
-            )
-        return None
+        return self._auth
 
     async def _rpc_call(self, method: str) -> dict[str, Any]:
         """Make a JSON-RPC call to the device.
@@ -104,7 +152,8 @@ class ShellyClient:
         try:
             response = await self._client.post(
                 url,
-                json=payload,
+                content=encode_json(payload),
+                headers=_JSON_HEADERS,
                 auth=self._get_auth(),
             )
 
@@ -112,7 +161,10 @@ class ShellyClient:
                 raise ShellyAuthError(f"Authentication failed: {response.status_code}")
 
             response.raise_for_status()
-            data = response.json()
+            # Decode the raw body directly; orjson is used when installed
+            data = decode_json(response.content)
+            if not isinstance(data, dict):
+                raise ShellyClientError(f"Unexpected RPC response: {type(data).__name__}")
 
             if "error" in data:
                 error = data["error"]
@@ -120,7 +172,10 @@ class ShellyClient:
                     f"RPC error {error.get('code', 'unknown')}: {error.get('message', 'Unknown error')}"
                 )
 
-            return data.get("result", {})
+            result = data.get("result", {})
+            if not isinstance(result, dict):
+                raise ShellyClientError(f"Unexpected RPC result: {type(result).__name__}")
+            return result
 
         except httpx.TimeoutException as e:
             raise ShellyTimeoutError(f"Request timed out: {e}") from e
@@ -151,23 +206,37 @@ class ShellyClient:
 class ShellyClientPool:
     """Pool of Shelly clients sharing a single httpx client for connection reuse."""
 
-    def __init__(self, timeout: float = 3.0, max_connections: int = 100) -> None:
+    def __init__(
+        self,
+        timeout: float = 3.0,
+        max_connections: int = 100,
+        keepalive_expiry: float = 300.0,
+    ) -> None:
         """Initialize client pool.
 
         Args:
             timeout: Request timeout in seconds
             max_connections: Maximum concurrent connections
+            keepalive_expiry: Seconds an idle connection is kept open for reuse;
+                should exceed the poll interval so each poll reuses its connection
         """
         self.timeout = timeout
         self._http_client: httpx.AsyncClient | None = None
         self._max_connections = max_connections
+        self._keepalive_expiry = keepalive_expiry
 
     async def __aenter__(self) -> ShellyClientPool:
         self._http_client = httpx.AsyncClient(
             timeout=self.timeout,
-            limits=httpx.Limits(
-                max_connections=self._max_connections,
-                max_keepalive_connections=self._max_connections // 2,
+            # Devices are polled repeatedly, so keep every connection alive between polls.
+            # No transport retries: failed polls go through the poller's backoff instead.
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                    keepalive_expiry=self._keepalive_expiry,
+                ),
+                retries=0,
             ),
         )
         return self
@@ -2,22 +2,90 @@
 
 from __future__ import annotations
 
+import asyncio
+import gzip
 import logging
+from time import monotonic as _monotonic
 
-from aiohttp import web
+from aiohttp import hdrs, web
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from shelly_exporter.metrics import metrics_version
+
 logger = logging.getLogger(__name__)
 
+# Base content type without charset (aiohttp handles charset separately)
+_METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST.split(";")[0].strip()
+
+# Headers for a gzip-encoded /metrics response
+_GZIP_HEADERS = {hdrs.CONTENT_ENCODING: "gzip", hdrs.VARY: hdrs.ACCEPT_ENCODING}
+
+# Longest time rendered output is reused. Default collectors (process_*, python_gc_*)
+# change without bumping the exporter's metrics version, so they refresh at least this often.
+_METRICS_CACHE_TTL = 1.0
+
+# (metrics version, render time, rendered output, gzipped output once requested)
+_metrics_cache: tuple[int, float, bytes, bytes | None] | None = None
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Return True if an Accept-Encoding header allows a gzip response.
+
+    Honors q-values, so "gzip;q=0" refuses gzip, and a "*" wildcard applies
+    only when gzip is not listed explicitly.
+    """
+    wildcard = False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding == "gzip":
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return wildcard
+
 
 async def metrics_handler(request: web.Request) -> web.Response:
-    """Handle /metrics endpoint for Prometheus scraping."""
-    metrics_output = generate_latest()
-    # Extract base content type without charset (aiohttp handles charset separately)
-    content_type = CONTENT_TYPE_LATEST.split(";")[0].strip()
+    """Handle /metrics endpoint for Prometheus scraping.
+
+    The rendered output is reused until an exporter metric is updated or
+    _METRICS_CACHE_TTL passes, and rendering runs in a worker thread so it
+    does not block polling. Clients accepting gzip (Prometheus does by
+    default) get a compressed body, which is also computed once per render.
+    """
+    global _metrics_cache
+    version = metrics_version()
+    now = _monotonic()
+    loop = asyncio.get_running_loop()
+    if (
+        _metrics_cache is None
+        or _metrics_cache[0] != version
+        or now - _metrics_cache[1] >= _METRICS_CACHE_TTL
+    ):
+        metrics_output = await loop.run_in_executor(None, generate_latest)
+        # Keyed by the version read before rendering, so updates made meanwhile re-render
+        _metrics_cache = (version, now, metrics_output, None)
+
+    cached_version, rendered_at, metrics_output, compressed = _metrics_cache
+    if not _accepts_gzip(request.headers.get(hdrs.ACCEPT_ENCODING, "")):
+        return web.Response(body=metrics_output, content_type=_METRICS_CONTENT_TYPE)
+
+    if compressed is None:
+        compressed = await loop.run_in_executor(None, gzip.compress, metrics_output)
+        if _metrics_cache[2] is metrics_output:
+            _metrics_cache = (cached_version, rendered_at, metrics_output, compressed)
     return web.Response(
-        body=metrics_output,
-        content_type=content_type,
+        body=compressed,
+        content_type=_METRICS_CONTENT_TYPE,
+        headers=_GZIP_HEADERS,
     )
 
 
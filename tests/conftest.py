@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 from pathlib import Path
 from typing import Any
@@ -12,11 +13,18 @@ import pytest
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
+@functools.cache
+def _read_fixture(name: str) -> bytes:
+    """Read a fixture file once per test session."""
+    return (FIXTURES_DIR / name).read_bytes()
+
+
 def load_fixture(name: str) -> dict[str, Any]:
-    """Load a JSON fixture file."""
-    path = FIXTURES_DIR / name
-    with open(path) as f:
-        return json.load(f)
+    """Load a JSON fixture file.
+
+    Each call parses a fresh dict, so tests may modify the result freely.
+    """
+    return json.loads(_read_fixture(name))
 
 
 @pytest.fixture
@@ -6,12 +6,14 @@ from typing import Any
 
 import pytest
 
+from shelly_exporter.config import TargetConfig
 from shelly_exporter.drivers.pro4pm_gen2 import Pro4PMGen2Driver
 from shelly_exporter.drivers.base import (
     ConnectionStatus,
     InputReading,
     SystemReading,
     WifiReading,
+    _extract_floats,
 )
 from shelly_exporter.metrics import (
     shelly_cloud_connected,
@@ -60,6 +62,32 @@ class TestSystemParsing:
         assert system.restart_required == 0.0  # False -> 0.0
         assert system.cfg_rev == 10
 
+    def test_parse_meta_matches_individual_parsers(
+        self,
+        driver: Pro4PMGen2Driver,
+        pro4pm_status: dict[str, Any],
+    ) -> None:
+        """Test the combined parser returns the same readings as the separate ones."""
+        system, wifi, connection = driver.parse_meta(pro4pm_status)
+
+        assert system == driver.parse_system(pro4pm_status)
+        assert wifi == driver.parse_wifi(pro4pm_status)
+        assert connection == driver.parse_connection_status(pro4pm_status)
+        assert driver.parse_meta({}) == (None, None, None)
+
+    def test_parse_all_matches_individual_parsers(
+        self,
+        driver: Pro4PMGen2Driver,
+        pro4pm_status: dict[str, Any],
+    ) -> None:
+        """Test parse_all returns channels, inputs and meta readings from one call."""
+        target = TargetConfig(name="pro4pm", url="10.0.0.1", channels=[{"type": "switch"}])
+        channels, inputs, *meta = driver.parse_all(pro4pm_status, target)
+
+        assert channels == driver.parse_status(pro4pm_status, target)
+        assert inputs == driver.parse_inputs(pro4pm_status)
+        assert tuple(meta) == driver.parse_meta(pro4pm_status)
+
     def test_parse_system_empty(self, driver: Pro4PMGen2Driver) -> None:
         """Test parsing when sys is missing."""
         system = driver.parse_system({})
@@ -76,6 +104,16 @@ class TestSystemParsing:
         assert system.restart_required == 1.0
 
 
+class TestExtractFloats:
+    """Tests for converting status fields to floats."""
+
+    def test_mixed_values(self) -> None:
+        """Test floats, ints and numeric strings convert and the rest become None."""
+        data = {"f": 1.5, "i": 2, "s": "3.5", "n": None, "bad": "x", "obj": {}}
+        keys = ("f", "i", "s", "n", "bad", "obj", "missing")
+        assert _extract_floats(data, keys) == [1.5, 2.0, 3.5, None, None, None, None]
+
+
 class TestWifiParsing:
     """Tests for WiFi metrics parsing."""
 
@@ -137,6 +175,16 @@ class TestConnectionParsing:
         conn = driver.parse_connection_status({})
         assert conn is None
 
+    def test_parse_connection_reuses_instances(self, driver: Pro4PMGen2Driver) -> None:
+        """Test identical connection states share one immutable instance."""
+        status = {"cloud": {"connected": True}, "mqtt": {"connected": False}}
+        first = driver.parse_connection_status(status)
+        second = driver.parse_connection_status(dict(status))
+
+        assert first is second
+        assert first is not None
+        assert (first.cloud_connected, first.mqtt_connected) == (1.0, 0.0)
+
     def test_parse_connection_mixed(self, driver: Pro4PMGen2Driver) -> None:
         """Test parsing when only some connections are present."""
         status = {"cloud": {"connected": True}}
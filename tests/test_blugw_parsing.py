@@ -66,6 +66,10 @@ class TestBluGwGen2Parsing:
         channels = driver.supported_channels(blugw_gen2_deviceinfo)
         assert channels == {}
 
+    def test_has_no_channels_flag(self, driver: BluGwGen2Driver) -> None:
+        """Test the gateway opts out of channel parsing."""
+        assert driver.HAS_CHANNELS is False
+
     def test_parse_system_data(
         self,
         driver: BluGwGen2Driver,
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import sys
 import tempfile
 from pathlib import Path
 
 import pytest
 import yaml
+from pydantic import ValidationError
 
 from shelly_exporter.config import (
     ChannelConfig,
@@ -56,6 +58,41 @@ class TestConfigModels:
         assert not channel.ignore_current
         assert not channel.ignore_output
 
+    def test_identical_channels_are_shared(self) -> None:
+        """Test that identical channel entries resolve to one frozen instance."""
+        config = Config.model_validate(
+            {
+                "targets": [
+                    {"name": "a", "url": "10.0.0.1", "channels": [{"type": "switch", "index": 0}]},
+                    {"name": "b", "url": "10.0.0.2", "target_meters": [0]},
+                ]
+            }
+        )
+
+        assert config.targets[0].channels[0] is config.targets[1].channels[0]
+        with pytest.raises(ValidationError):
+            config.targets[0].channels[0].index = 1
+
+    def test_target_config_is_frozen(self) -> None:
+        """Test that targets cannot be modified after validation."""
+        target = TargetConfig(name="frozen", url="10.0.0.1")
+
+        with pytest.raises(ValidationError):
+            target.discovered = True
+
+    def test_label_strings_are_interned(self) -> None:
+        """Test the target name and channel index label strings are interned."""
+        target = TargetConfig(
+            # Built at runtime: a literal is interned at compile time, proving nothing
+            name="".join(["intern", "_test"]),  # noqa: FLY002
+            url="10.0.0.1",
+            channels=[{"type": "switch", "index": 3}],
+        )
+
+        assert target.name is sys.intern("intern_test")
+        assert target.channels[0]._index_str == "3"
+        assert target.channels[0]._index_str is sys.intern("3")
+
     def test_target_config(self) -> None:
         """Test target configuration."""
         target = TargetConfig(
@@ -115,6 +152,46 @@ class TestConfigModels:
         target_no_override = TargetConfig(name="t2", url="10.0.0.2")
         assert config.get_target_poll_interval(target_no_override) == 10
 
+    def test_get_channel_by_type_and_index(self) -> None:
+        """Test channel lookup by (type, index)."""
+        target = TargetConfig(
+            name="t1",
+            url="10.0.0.1",
+            channels=[
+                {"type": "switch", "index": 0, "label": "first"},
+                {"type": "light", "index": 0},
+                {"type": "switch", "index": 0, "label": "duplicate"},
+            ],
+        )
+
+        assert target.get_channel("switch", 0).label == "first"
+        assert target.get_channel("light", 0) is target.channels[1]
+        assert target.get_channel("switch", 1) is None
+
+    def test_effective_settings_resolved_at_load(self) -> None:
+        """Test targets owned by the config get their settings precomputed."""
+        config = Config.model_validate(
+            {
+                "poll_interval_seconds": 15,
+                "default_credentials": {"username": "u", "password": "p"},
+                "targets": [
+                    {"name": "t1", "url": "10.0.0.1"},
+                    {"name": "t2", "url": "10.0.0.2", "poll_interval_seconds": 3},
+                ],
+            }
+        )
+
+        t1, t2 = config.targets
+        assert t1._resolved_from is not None
+        assert t1._effective_poll_interval == 15
+        assert t2._effective_poll_interval == 3
+        assert config.get_target_credentials(t1) is config.default_credentials
+
+        # A different config resolves the same target against its own defaults
+        other = Config(poll_interval_seconds=60)
+        assert other.get_target_poll_interval(t1) == 60
+        assert other.get_target_credentials(t1) is None
+
 
 class TestLegacyTargetMeters:
     """Tests for backward compatibility with target_meters."""
@@ -213,3 +290,79 @@ class TestConfigLoading:
         assert target.credentials.username == "user1"
         assert target.channels[0].ignore_voltage is True
         assert target.channels[0].ignore_temperature is True
+
+    def test_load_config_cache_reuses_and_invalidates(self) -> None:
+        """Test that repeated loads reuse the parse and pick up file changes."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yml", delete=False) as f:
+            yaml.dump(
+                {
+                    "targets": [
+                        {"name": "legacy", "url": "10.0.0.1", "target_meters": [0, 1]}
+                    ]
+                },
+                f,
+            )
+            f.flush()
+            first = load_config(f.name)
+            second = load_config(f.name)
+
+        # The cached parse is validated repeatedly and must not be altered by the legacy conversion
+        assert first == second
+        assert len(second.targets[0].channels) == 2
+
+        with open(f.name, "w") as f2:
+            yaml.dump({"targets": [{"name": "changed", "url": "10.0.0.2"}]}, f2)
+
+        assert load_config(f.name).targets[0].name == "changed"
+
+    def test_load_config_uses_json_sidecar(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a matching JSON sidecar is written to the cache dir and used next load."""
+        from shelly_exporter import config as config_module
+
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setenv("CONFIG_CACHE_DIR", str(cache_dir))
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(
+            yaml.dump(
+                {
+                    "poll_interval_seconds": 7,
+                    "targets": [{"name": "d1", "url": "10.0.0.1", "target_meters": [0]}],
+                }
+            )
+        )
+
+        first = load_config(config_file)
+        assert not (tmp_path / "config.yml.cache.json").exists()
+        sidecars = list(cache_dir.iterdir())
+        assert len(sidecars) == 1
+        assert sidecars[0].name.startswith("config.yml.")
+
+        config_module._config_cache.clear()
+        second = load_config(config_file)
+        assert second == first
+        assert second.poll_interval_seconds == 7
+        assert second.targets[0].channels[0].type == "switch"
+
+        # A stale sidecar is ignored once the YAML changes
+        config_file.write_text(yaml.dump({"poll_interval_seconds": 20}))
+        assert load_config(config_file).poll_interval_seconds == 20
+
+    def test_load_config_sidecar_opt_in_and_no_credentials(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test no sidecar is written unless enabled, nor for configs with credentials."""
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(yaml.dump({"poll_interval_seconds": 7}))
+        monkeypatch.delenv("CONFIG_CACHE_DIR", raising=False)
+        load_config(config_file)
+        assert [p.name for p in tmp_path.iterdir()] == ["config.yml"]
+
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setenv("CONFIG_CACHE_DIR", str(cache_dir))
+        config_file.write_text(
+            yaml.dump({"default_credentials": {"username": "admin", "password": "secret"}})
+        )
+        assert load_config(config_file).default_credentials.password == "secret"
+        assert not cache_dir.exists()
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
@@ -64,6 +66,73 @@ class TestConfigFileHandler:
         assert handler._pending_reload is None
         loop.close()
 
+    async def test_event_burst_fires_single_reload(self) -> None:
+        """Test that a burst of events is debounced into one callback."""
+        callback = MagicMock()
+        handler = ConfigFileHandler(
+            config_path=Path("/tmp/config.yml"),
+            callback=callback,
+            debounce_seconds=0.05,
+        )
+        handler.set_loop(asyncio.get_running_loop())
+
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = "/tmp/config.yml"
+
+        for _ in range(5):
+            handler.on_modified(event)
+            await asyncio.sleep(0.02)
+
+        # Deadline keeps moving, so nothing has fired yet
+        callback.assert_not_called()
+
+        await asyncio.sleep(0.15)
+        callback.assert_called_once()
+        assert handler._pending_reload is None
+
+    async def test_observer_thread_event_arms_timer_on_loop(self) -> None:
+        """Test that an event from another thread leaves the debounce state to the loop."""
+        callback = MagicMock()
+        handler = ConfigFileHandler(
+            config_path=Path("/tmp/config.yml"),
+            callback=callback,
+            debounce_seconds=0.01,
+        )
+        handler.set_loop(asyncio.get_running_loop())
+
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = "/tmp/config.yml"
+
+        # Join without yielding, so the loop cannot run the handoff yet
+        observer = threading.Thread(target=handler.on_modified, args=(event,))
+        observer.start()
+        observer.join()
+        assert handler._deadline is None
+        assert handler._pending_reload is None
+
+        await asyncio.sleep(0.1)
+        callback.assert_called_once()
+
+    async def test_bytes_src_path_schedules_reload(self) -> None:
+        """Test that events carrying a bytes path still match the config file."""
+        callback = MagicMock()
+        handler = ConfigFileHandler(
+            config_path=Path("/tmp/config.yml"),
+            callback=callback,
+            debounce_seconds=0.01,
+        )
+        handler.set_loop(asyncio.get_running_loop())
+
+        event = MagicMock()
+        event.is_directory = False
+        event.src_path = os.fsencode("/tmp/config.yml")
+
+        handler.on_created(event)
+        await asyncio.sleep(0.1)
+        callback.assert_called_once()
+
 
 class TestConfigWatcher:
     """Tests for ConfigWatcher class."""
@@ -301,3 +370,119 @@ class TestPollerConfigUpdate:
         result = await poller.remove_target("nonexistent")
 
         assert result is False
+
+
+class TestConfigWatcherContentHash:
+    """Tests for skipping reloads when the config content is unchanged."""
+
+    async def test_unchanged_content_skips_callback(self, tmp_path: Path) -> None:
+        """Test that a reload with identical content does not notify callbacks."""
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(yaml.dump({"targets": []}))
+
+        reload_callback = AsyncMock()
+        watcher = ConfigWatcher(config_path=config_file, on_reload=reload_callback)
+
+        try:
+            await watcher.start()
+
+            assert await watcher._reload_config() is True
+            reload_callback.assert_not_called()
+
+            config_file.write_text(
+                yaml.dump({"targets": [{"name": "d1", "url": "10.0.0.1"}]})
+            )
+            assert await watcher._reload_config() is True
+            reload_callback.assert_called_once()
+        finally:
+            await watcher.stop()
+
+    async def test_same_size_edit_with_same_mtime_reloads(self, tmp_path: Path) -> None:
+        """Test an in-place edit keeping size and mtime is still picked up."""
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(yaml.dump({"poll_interval_seconds": 10}))
+        st = config_file.stat()
+
+        reload_callback = AsyncMock()
+        watcher = ConfigWatcher(config_path=config_file, on_reload=reload_callback)
+
+        try:
+            await watcher.start()
+
+            config_file.write_text(yaml.dump({"poll_interval_seconds": 20}))
+            os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+            assert config_file.stat().st_size == st.st_size
+
+            assert await watcher._reload_config() is True
+            reload_callback.assert_called_once()
+            assert watcher.current_config is not None
+            assert watcher.current_config.poll_interval_seconds == 20
+        finally:
+            await watcher.stop()
+
+    async def test_force_reload_ignores_unchanged_content(self, tmp_path: Path) -> None:
+        """Test that force_reload reloads and notifies even if the file is unchanged."""
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(yaml.dump({"targets": []}))
+
+        reload_callback = AsyncMock()
+        watcher = ConfigWatcher(config_path=config_file, on_reload=reload_callback)
+
+        try:
+            await watcher.start()
+
+            assert await watcher.force_reload() is True
+            reload_callback.assert_called_once()
+        finally:
+            await watcher.stop()
+
+    async def test_file_change_runs_reload_task(self, tmp_path: Path) -> None:
+        """Test that a debounced change notification reloads without a queue."""
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(yaml.dump({"targets": []}))
+
+        reload_callback = AsyncMock()
+        watcher = ConfigWatcher(config_path=config_file, on_reload=reload_callback)
+
+        try:
+            await watcher.start()
+            config_file.write_text(
+                yaml.dump({"targets": [{"name": "d1", "url": "10.0.0.1"}]})
+            )
+
+            watcher._on_file_changed()
+            assert watcher._reload_task is not None
+            await watcher._reload_task
+
+            reload_callback.assert_called_once()
+            assert watcher.current_config is not None
+            assert len(watcher.current_config.targets) == 1
+        finally:
+            await watcher.stop()
+
+    async def test_file_write_triggers_reload(self, tmp_path: Path) -> None:
+        """Test the end-to-end watch path (inotify on Linux, watchdog elsewhere)."""
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(yaml.dump({"targets": []}))
+
+        reload_callback = AsyncMock()
+        watcher = ConfigWatcher(
+            config_path=config_file,
+            on_reload=reload_callback,
+            debounce_seconds=0.05,
+        )
+
+        try:
+            await watcher.start()
+            config_file.write_text(
+                yaml.dump({"targets": [{"name": "d1", "url": "10.0.0.1"}]})
+            )
+
+            for _ in range(50):
+                if reload_callback.called:
+                    break
+                await asyncio.sleep(0.05)
+
+            reload_callback.assert_called_once()
+        finally:
+            await watcher.stop()
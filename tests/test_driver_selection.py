@@ -7,8 +7,11 @@ from typing import Any
 import pytest
 
 from shelly_exporter.drivers.base import DeviceDriver
+from shelly_exporter.drivers.blugw_gen2 import BluGwGen2Driver
+from shelly_exporter.drivers.blugw_gen3 import BluGwGen3Driver
 from shelly_exporter.drivers.dimmer_0110vpm_g3 import Dimmer0110VPMG3Driver
 from shelly_exporter.drivers.plugus_gen2 import PlugUSGen2Driver
+from shelly_exporter.drivers.pluswalldimmer_gen2 import PlusWallDimmerGen2Driver
 from shelly_exporter.drivers.pro2pm_gen2 import Pro2PMGen2Driver
 from shelly_exporter.drivers.pro4pm_gen2 import Pro4PMGen2Driver
 from shelly_exporter.drivers.registry import DriverRegistry, get_registry
@@ -41,6 +44,67 @@ class TestDriverRegistry:
         registry.register(Pro4PMGen2Driver())
         assert len(registry.list_drivers()) == 1
 
+    def test_selection_cached_per_gen_app(self) -> None:
+        """Test repeat lookups reuse the cached selection until a new driver registers."""
+        registry = DriverRegistry()
+        registry.register(Pro4PMGen2Driver())
+        device_info = {"gen": 2, "app": "PlugUS", "model": "SNPL-00116US"}
+
+        assert registry.get_best_driver(device_info) is None
+        assert registry._selection_cache[(2, "PlugUS", "SNPL-00116US")] is None
+
+        # Registering a driver invalidates the cached miss
+        plugus = PlugUSGen2Driver()
+        registry.register(plugus)
+        assert registry.get_best_driver(device_info) is plugus
+        assert registry.get_best_driver(dict(device_info)) is plugus
+
+    def test_exact_match_and_scoring_fallback(self) -> None:
+        """Test exact (gen, app) drivers dispatch directly and others are scored."""
+
+        class AnyGen5Driver(Pro4PMGen2Driver):
+            _MATCH = None
+
+            def score(self, device_info: dict[str, Any]) -> int:
+                return 10 if device_info.get("gen") == 5 else 0
+
+        registry = DriverRegistry()
+        pro4pm = Pro4PMGen2Driver()
+        fallback = AnyGen5Driver()
+        registry.register(pro4pm)
+        registry.register(fallback)
+
+        assert registry._by_match == {(2, "Pro4PM"): pro4pm}
+        assert registry.get_best_driver({"gen": 2, "app": "Pro4PM"}) is pro4pm
+        assert registry.get_best_driver({"gen": 5, "app": "NewThing"}) is fallback
+
+    def test_match_keys_can_claim_several_families(self) -> None:
+        """Test a driver can register more than one exact (gen, app) pair."""
+
+        class PlugFamilyDriver(PlugUSGen2Driver):
+            def match_keys(self) -> tuple[tuple[int, str], ...]:
+                return ((2, "PlugUS"), (2, "PlugUK"))
+
+        registry = DriverRegistry()
+        driver = PlugFamilyDriver()
+        registry.register(driver)
+
+        assert registry.get_best_driver({"gen": 2, "app": "PlugUK"}) is driver
+        assert Pro4PMGen2Driver().match_keys() == ((2, "Pro4PM"),)
+
+    def test_driver_with_failing_score_is_rejected(self) -> None:
+        """Test a driver whose score() raises is not registered."""
+
+        class BrokenDriver(Pro4PMGen2Driver):
+            def score(self, device_info: dict[str, Any]) -> int:
+                raise KeyError("gen")
+
+        registry = DriverRegistry()
+        registry.register(BrokenDriver())
+
+        assert registry.list_drivers() == []
+        assert registry._by_match == {}
+
 
 class TestDriverSelection:
     """Tests for selecting the best driver for a device."""
@@ -181,3 +245,27 @@ class TestSupportedChannels:
         assert "light" in channels
         assert channels["light"] == {0}
         assert "switch" not in channels
+
+    @pytest.mark.parametrize(
+        "driver_cls",
+        [Pro2PMGen2Driver, Pro4PMGen2Driver, Shelly1PMGen4Driver, PlugUSGen2Driver],
+    )
+    def test_switch_channels_are_read_only(self, driver_cls: type[DeviceDriver]) -> None:
+        """Test the shared switch channel mapping cannot be changed through a caller."""
+        channels = driver_cls().supported_channels({})
+
+        with pytest.raises(TypeError):
+            channels["light"] = frozenset({0})  # type: ignore[index]
+        assert "light" not in driver_cls().supported_channels({})
+
+    @pytest.mark.parametrize(
+        "driver_cls",
+        [Dimmer0110VPMG3Driver, PlusWallDimmerGen2Driver, BluGwGen2Driver, BluGwGen3Driver],
+    )
+    def test_class_channel_tables_are_read_only(self, driver_cls: type[DeviceDriver]) -> None:
+        """Test drivers returning a class-level channel table hand out a read-only view."""
+        channels = driver_cls().supported_channels({})
+
+        with pytest.raises(TypeError):
+            channels["switch"] = frozenset({0})  # type: ignore[index]
+        assert "switch" not in driver_cls().supported_channels({})
@@ -0,0 +1,129 @@
+"""Tests for the extract_discovered helper script."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+import yaml
+
+import extract_discovered
+from extract_discovered import (
+    _url_to_host,
+    build_entries,
+    generate_yaml,
+    get_existing_ips,
+    parse_metrics,
+)
+
+METRICS = b"""# HELP shelly_discovered_device_info Information about discovered Shelly devices
+# TYPE shelly_discovered_device_info gauge
+shelly_discovered_device_info{app="Pro4PM",discovered_at="2024-01-01T00:00:00",gen="2",ip="10.0.80.53",mac="A8032AB12345",model="SPSW-104PE16EU"} 1.0
+shelly_discovered_device_info{ip="10.0.80.60",model="S3SN-0U12A"} 1.0
+shelly_up{device="other"} 1.0
+"""
+
+DEVICES: dict[str, list[str]] = {
+    "ip": ["10.0.80.53", "10.0.80.54", "10.0.80.60"],
+    "app": ["Pro2PM", "Pro4PM", "BluGw"],
+    "gen": ["2", "2", "2"],
+    "model": ["SPSW-202PE16EU", "SPSW-104PE16EU", "SNGW-BT01"],
+    "mac": ["A8032AB11111", "A8032AB12345", "A8032AB19999"],
+    "discovered_at": ["", "", ""],
+}
+
+
+def _client(body: bytes) -> httpx.Client:
+    return httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(200, content=body)))
+
+
+class TestParseMetrics:
+    """Tests for parsing discovered devices from metrics output."""
+
+    def test_parses_quoted_labels_into_columns(self) -> None:
+        """Test label values are read into one column per label, in line order."""
+        with _client(METRICS) as client:
+            devices = parse_metrics(client)
+
+        assert devices["ip"] == ["10.0.80.53", "10.0.80.60"]
+        assert devices["app"][0] == "Pro4PM"
+        assert devices["gen"][0] == "2"
+        assert devices["mac"][0] == "A8032AB12345"
+        assert devices["discovered_at"][0] == "2024-01-01T00:00:00"
+
+    def test_missing_labels_use_defaults(self) -> None:
+        """Test labels absent from a line fall back to their column defaults."""
+        with _client(METRICS) as client:
+            devices = parse_metrics(client)
+
+        assert devices["model"][1] == "S3SN-0U12A"
+        assert devices["app"][1] == "unknown"
+        assert devices["gen"][1] == "0"
+        assert devices["mac"][1] == ""
+
+
+class TestExistingIps:
+    """Tests for reading hosts already in the config file."""
+
+    @pytest.mark.parametrize(
+        ("url", "host"),
+        [
+            (b"10.0.80.1", "10.0.80.1"),
+            (b'"10.0.80.1"', "10.0.80.1"),
+            (b"'http://10.0.80.1'", "10.0.80.1"),
+            (b"https://10.0.80.1:8080/rpc", "10.0.80.1"),
+            (b"shelly-kitchen.local/", "shelly-kitchen.local"),
+        ],
+    )
+    def test_url_to_host(self, url: bytes, host: str) -> None:
+        """Test url values are reduced to the bare host."""
+        assert _url_to_host(url) == host
+
+    def test_get_existing_ips(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test url entries in the config file are collected as hosts."""
+        config_file = tmp_path / "config.yml"
+        config_file.write_text(
+            "targets:\n"
+            "  - name: a\n"
+            "    url: http://10.0.80.1  # kitchen\n"
+            "  - url: '10.0.80.2'\n"
+            "    name: b\n"
+        )
+        monkeypatch.setattr(extract_discovered, "CONFIG_FILE", str(config_file))
+        monkeypatch.setattr(extract_discovered, "_ip_cache", {})
+
+        assert get_existing_ips() == frozenset({"10.0.80.1", "10.0.80.2"})
+
+
+class TestGenerateYaml:
+    """Tests for building config entries and YAML output."""
+
+    def test_build_entries_skips_configured_hosts(self) -> None:
+        """Test hosts already in the config are left out and channels follow the app."""
+        entries = build_entries(DEVICES, {"10.0.80.54"})
+
+        assert [e["url"] for e in entries] == ["10.0.80.53", "10.0.80.60"]
+        assert entries[0]["name"] == "shelly_10_0_80_53_1111_spsw_202pe16eu"
+        assert entries[0]["channels"] == [
+            {"type": "switch", "index": 0},
+            {"type": "switch", "index": 1},
+        ]
+        assert entries[1]["channels"] == []
+
+    def test_entries_do_not_share_channel_table(self) -> None:
+        """Test modifying a returned entry leaves later results unchanged."""
+        build_entries(DEVICES, set())[0]["channels"][0]["index"] = 99
+        assert build_entries(DEVICES, set())[0]["channels"][0]["index"] == 0
+
+    def test_generate_yaml_is_valid_target_list(self) -> None:
+        """Test the YAML output parses back to the built entries."""
+        output = generate_yaml(DEVICES, set())
+
+        assert output.startswith("# Discovered devices")
+        assert yaml.safe_load(output) == build_entries(DEVICES, set())
+
+    def test_generate_yaml_without_new_devices(self) -> None:
+        """Test a comment is emitted when every device is already configured."""
+        output = generate_yaml(DEVICES, set(DEVICES["ip"]))
+        assert output == "# No new discovered devices to add (all already in config)\n"
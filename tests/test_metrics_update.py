@@ -8,8 +8,13 @@ import pytest
 from prometheus_client import REGISTRY
 
 from shelly_exporter.config import ChannelConfig, TargetConfig
-from shelly_exporter.drivers.base import ChannelReading, DeviceReading
+from shelly_exporter.drivers.base import ChannelReading, DeviceReading, SystemReading
 from shelly_exporter.metrics import (
+    _SYSTEM_METRICS,
+    _child_cache,
+    _emit_plan,
+    _emit_plans,
+    forget_device_metrics,
     shelly_light_aenergy,
     shelly_light_apower,
     shelly_light_brightness,
@@ -25,10 +30,13 @@ from shelly_exporter.metrics import (
     shelly_switch_ret_aenergy,
     shelly_switch_temperature,
     shelly_switch_voltage,
+    shelly_sys_ram_size,
+    shelly_sys_uptime,
     shelly_up,
     update_channel_metrics,
     update_device_metrics,
     update_metrics_from_reading,
+    update_system_metrics,
 )
 
 
@@ -69,6 +77,27 @@ class TestDeviceMetrics:
 
         assert shelly_poll_duration.labels(device="duration_test")._value.get() == 1.234
 
+    def test_labeled_children_are_cached(self) -> None:
+        """Test repeat updates reuse the same labeled gauge child."""
+        reading = DeviceReading(device_name="cache_test", up=True)
+        update_device_metrics(reading)
+        update_device_metrics(reading)
+
+        child = _child_cache[(id(shelly_up), ("cache_test",))]
+        assert child is shelly_up.labels(device="cache_test")
+        assert child._value.get() == 1.0
+
+    def test_emit_plan_is_reused(self) -> None:
+        """Test system metrics are emitted through a plan built once per device."""
+        system = SystemReading(uptime_seconds=42.0)
+        update_system_metrics("plan_test", system)
+        plan = _emit_plan(_SYSTEM_METRICS, ("plan_test",))
+        update_system_metrics("plan_test", system)
+
+        assert _emit_plan(_SYSTEM_METRICS, ("plan_test",)) is plan
+        assert shelly_sys_uptime.labels(device="plan_test")._value.get() == 42.0
+        assert math.isnan(shelly_sys_ram_size.labels(device="plan_test")._value.get())
+
 
 class TestSwitchMetrics:
     """Tests for switch channel metrics updates."""
@@ -92,7 +121,7 @@ class TestSwitchMetrics:
         channel_config = ChannelConfig(type="switch", index=0)
         update_channel_metrics("switch_test", reading, channel_config)
 
-        labels = {"device": "switch_test", "meter": "0"}
+        labels = {"device": "switch_test", "meter": "0", "label": ""}
         assert shelly_switch_output.labels(**labels)._value.get() == 1.0
         assert shelly_switch_apower.labels(**labels)._value.get() == 125.5
         assert shelly_switch_voltage.labels(**labels)._value.get() == 121.3
@@ -121,7 +150,7 @@ class TestSwitchMetrics:
 
         update_channel_metrics("nan_test", reading, None)
 
-        labels = {"device": "nan_test", "meter": "1"}
+        labels = {"device": "nan_test", "meter": "1", "label": ""}
         assert math.isnan(shelly_switch_apower.labels(**labels)._value.get())
         assert math.isnan(shelly_switch_voltage.labels(**labels)._value.get())
         assert math.isnan(shelly_switch_temperature.labels(**labels)._value.get())
@@ -144,7 +173,7 @@ class TestSwitchMetrics:
         )
 
         # Get initial values
-        labels = {"device": "ignore_test", "meter": "2"}
+        labels = {"device": "ignore_test", "meter": "2", "label": ""}
 
         # Update should skip ignored metrics
         update_channel_metrics("ignore_test", reading, channel_config)
@@ -152,6 +181,16 @@ class TestSwitchMetrics:
         # Output should be updated (not ignored)
         assert shelly_switch_output.labels(**labels)._value.get() == 1.0
 
+    def test_switch_metrics_with_label(self) -> None:
+        """Test a configured channel label is used as the label value."""
+        reading = ChannelReading(channel_type="switch", channel_index=3, output=1.0)
+        channel_config = ChannelConfig(type="switch", index=3, label="workshop_lights")
+
+        update_channel_metrics("label_test", reading, channel_config)
+
+        labels = {"device": "label_test", "meter": "3", "label": "workshop_lights"}
+        assert shelly_switch_output.labels(**labels)._value.get() == 1.0
+
 
 class TestLightMetrics:
     """Tests for light channel metrics updates."""
@@ -170,7 +209,7 @@ class TestLightMetrics:
         channel_config = ChannelConfig(type="light", index=0)
         update_channel_metrics("light_test", reading, channel_config)
 
-        labels = {"device": "light_test", "channel": "0"}
+        labels = {"device": "light_test", "channel": "0", "label": ""}
         assert shelly_light_output.labels(**labels)._value.get() == 1.0
         assert shelly_light_brightness.labels(**labels)._value.get() == 75.0
         assert shelly_light_apower.labels(**labels)._value.get() == 18.5
@@ -189,7 +228,7 @@ class TestLightMetrics:
 
         update_channel_metrics("light_nan_test", reading, None)
 
-        labels = {"device": "light_nan_test", "channel": "1"}
+        labels = {"device": "light_nan_test", "channel": "1", "label": ""}
         assert shelly_light_output.labels(**labels)._value.get() == 0.0
         assert math.isnan(shelly_light_brightness.labels(**labels)._value.get())
         assert math.isnan(shelly_light_apower.labels(**labels)._value.get())
@@ -237,12 +276,58 @@ class TestCombinedMetricsUpdate:
         assert shelly_poll_duration.labels(device="combined_test")._value.get() == 0.25
 
         # Check switch metrics
-        assert shelly_switch_output.labels(device="combined_test", meter="0")._value.get() == 1.0
-        assert shelly_switch_apower.labels(device="combined_test", meter="0")._value.get() == 100.0
+        assert (
+            shelly_switch_output.labels(device="combined_test", meter="0", label="")._value.get()
+            == 1.0
+        )
+        assert (
+            shelly_switch_apower.labels(device="combined_test", meter="0", label="")._value.get()
+            == 100.0
+        )
 
         # Check light metrics
-        assert shelly_light_output.labels(device="combined_test", channel="0")._value.get() == 1.0
         assert (
-            shelly_light_brightness.labels(device="combined_test", channel="0")._value.get()
+            shelly_light_output.labels(device="combined_test", channel="0", label="")._value.get()
+            == 1.0
+        )
+        assert (
+            shelly_light_brightness.labels(
+                device="combined_test", channel="0", label=""
+            )._value.get()
             == 50.0
         )
+
+    def test_failed_poll_skips_reading_sections(self) -> None:
+        """Test a failed poll publishes device-down state only."""
+        device_reading = DeviceReading(
+            device_name="down_test",
+            up=False,
+            error_message="Connection timeout",
+            system=SystemReading(uptime_seconds=99.0),
+            channels=[ChannelReading(channel_type="switch", channel_index=0, output=1.0)],
+        )
+        target_config = TargetConfig(name="down_test", url="10.0.0.2")
+
+        update_metrics_from_reading(device_reading, target_config)
+
+        assert shelly_up.labels(device="down_test")._value.get() == 0.0
+        assert _emit_plans.get((id(_SYSTEM_METRICS), ("down_test",))) is None
+        assert (
+            shelly_switch_output.labels(device="down_test", meter="0", label="")._value.get() == 0.0
+        )
+
+    def test_forget_device_metrics_drops_cached_entries(self) -> None:
+        """Test cached children and plans for a removed device are released."""
+        device_reading = DeviceReading(
+            device_name="forget_test",
+            up=True,
+            system=SystemReading(uptime_seconds=1.0),
+            channels=[ChannelReading(channel_type="switch", channel_index=0, output=1.0)],
+        )
+        update_metrics_from_reading(device_reading, TargetConfig(name="forget_test", url="x"))
+        assert any(k[1][0] == "forget_test" for k in _child_cache)
+
+        forget_device_metrics("forget_test")
+
+        assert not any(k[1][0] == "forget_test" for k in _child_cache)
+        assert not any(k[1][0] == "forget_test" for k in _emit_plans)
@@ -0,0 +1,323 @@
+"""Tests for poller scheduling."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any
+
+import pytest
+
+from shelly_exporter.config import Config, TargetConfig
+from shelly_exporter.drivers.registry import get_registry
+from shelly_exporter.metrics import _child_cache, _device_cache_keys, shelly_poll_skipped
+from shelly_exporter.poller import DevicePoller, TargetState, _AdmissionController
+from shelly_exporter.shelly_client import ShellyClient
+
+
+class RecordingPoller(DevicePoller):
+    """Poller that records polls instead of contacting devices."""
+
+    def __init__(self, config: Config) -> None:
+        super().__init__(config)
+        self.polled: list[str] = []
+
+    async def _poll_target(self, state: TargetState) -> None:
+        self.polled.append(state.target.name)
+        self._schedule_next_poll(state, asyncio.get_running_loop().time())
+
+
+class TestPollingLoop:
+    """Tests for the event-driven polling loop."""
+
+    async def test_sleeps_until_next_poll_is_due(self) -> None:
+        """Test the loop does not re-poll a target before its interval elapses."""
+        config = Config(poll_interval_seconds=60, targets=[TargetConfig(name="a", url="10.0.0.1")])
+        poller = RecordingPoller(config)
+        poller._states["a"] = TargetState(target=config.targets[0])
+        poller._running = True
+
+        loop_task = asyncio.create_task(poller._polling_loop())
+        await asyncio.sleep(0.05)
+        assert poller.polled == ["a"]
+        assert poller._states["a"].next_poll_time > asyncio.get_running_loop().time() + 50
+
+        await poller.stop()
+        await asyncio.wait_for(loop_task, 1.0)
+
+    async def test_added_target_wakes_loop(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test adding a target interrupts the sleep and polls it once its first poll is due."""
+        monkeypatch.setattr(random, "random", lambda: 0.0)
+        poller = RecordingPoller(Config())
+        poller._running = True
+
+        loop_task = asyncio.create_task(poller._polling_loop())
+        await asyncio.sleep(0.01)
+        await poller.add_target(TargetConfig(name="new", url="10.0.0.2"))
+        await asyncio.sleep(0.01)
+        assert poller.polled == ["new"]
+
+        await poller.stop()
+        await asyncio.wait_for(loop_task, 1.0)
+
+    async def test_slow_target_does_not_block_others(self) -> None:
+        """Test a poll still in flight is not rescheduled and does not delay other targets."""
+        release = asyncio.Event()
+
+        class SlowPoller(RecordingPoller):
+            async def _poll_target(self, state: TargetState) -> None:
+                if state.target.name == "slow":
+                    await release.wait()
+                await super()._poll_target(state)
+
+        config = Config(
+            targets=[
+                TargetConfig(name="slow", url="10.0.0.1"),
+                TargetConfig(name="fast", url="10.0.0.2"),
+            ]
+        )
+        poller = SlowPoller(config)
+        for target in config.targets:
+            poller._states[target.name] = TargetState(target=target)
+        poller._running = True
+
+        loop_task = asyncio.create_task(poller._polling_loop())
+        await asyncio.sleep(0.05)
+        assert poller._states["slow"].in_flight
+        assert poller.polled == ["fast"]
+
+        release.set()
+        await poller.stop()
+        await asyncio.wait_for(loop_task, 1.0)
+        assert poller.polled == ["fast", "slow"]
+        assert not poller._inflight
+
+    async def test_overrunning_poll_counts_skipped_ticks(self) -> None:
+        """Test a poll longer than the interval records the ticks it skipped."""
+
+        class SlowPoller(DevicePoller):
+            async def _poll_target(self, state: TargetState) -> None:
+                await asyncio.sleep(0.035)
+
+        poller = SlowPoller(Config())
+        state = TargetState(target=TargetConfig(name="overrun", url="10.0.0.1"))
+        state.poll_interval = 0.01  # type: ignore[assignment]
+        state.in_flight = True
+        poller._states["overrun"] = state
+
+        await poller._run_poll(state)
+
+        assert not state.in_flight
+        assert shelly_poll_skipped.labels(device="overrun")._value.get() >= 3.0
+
+
+class TestAdmissionController:
+    """Tests for the resizable concurrency limit."""
+
+    async def test_resize_admits_waiters(self) -> None:
+        """Test raising the limit lets a waiting poll proceed."""
+        admission = _AdmissionController(1)
+        await admission.acquire()
+
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        await admission.resize(2)
+        await asyncio.wait_for(waiter, 1.0)
+        assert admission._active == 2
+
+        await admission.release()
+        await admission.release()
+        assert admission._active == 0
+
+
+class TestTargetManagement:
+    """Tests for adding, removing and reloading targets."""
+
+    async def test_url_index_follows_target_changes(self) -> None:
+        """Test has_target_url tracks add_target, remove_target and update_config."""
+        poller = DevicePoller(Config())
+        await poller.add_target(TargetConfig(name="a", url="10.0.0.1"))
+        await poller.add_target(TargetConfig(name="b", url="10.0.0.2"))
+        assert poller.has_target_url("10.0.0.1")
+
+        await poller.remove_target("a")
+        assert not poller.has_target_url("10.0.0.1")
+        assert poller.has_target_url("10.0.0.2")
+
+        await poller.update_config(
+            Config(
+                targets=[
+                    TargetConfig(name="b", url="10.0.0.20"),
+                    TargetConfig(name="c", url="10.0.0.3"),
+                ]
+            )
+        )
+        assert not poller.has_target_url("10.0.0.2")
+        assert poller.has_target_url("10.0.0.20")
+        assert poller.has_target_url("10.0.0.3")
+
+    async def test_unchanged_device_info_skips_driver_selection(self) -> None:
+        """Test a device-info refresh with the same identity keeps the driver."""
+
+        class StubClient:
+            def __init__(self, device_info: dict[str, Any]) -> None:
+                self.device_info = device_info
+
+            async def get_device_info(self) -> dict[str, Any]:
+                return self.device_info
+
+        class CountingRegistry:
+            def __init__(self) -> None:
+                self.calls = 0
+
+            def get_best_driver(self, device_info: dict[str, Any]) -> Any:
+                self.calls += 1
+                return get_registry().get_best_driver(device_info)
+
+        poller = DevicePoller(Config())
+        registry = CountingRegistry()
+        poller._registry = registry  # type: ignore[assignment]
+        state = TargetState(target=TargetConfig(name="plug", url="10.0.0.1"))
+        info = {"gen": 2, "app": "PlugUS", "model": "SNPL-00116US", "mac": "AABBCC"}
+
+        await poller._fetch_device_info(StubClient(info), state)  # type: ignore[arg-type]
+        await poller._fetch_device_info(StubClient(dict(info)), state)  # type: ignore[arg-type]
+        assert registry.calls == 1
+        assert state.driver is not None
+
+        await poller._fetch_device_info(  # type: ignore[arg-type]
+            StubClient({**info, "app": "Pro4PM"}), state
+        )
+        assert registry.calls == 2
+        assert state.driver.driver_id == "pro4pm_gen2"
+
+    async def test_effective_settings_cached_until_config_update(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test per-target settings and client are cached and refreshed after a reload."""
+        monkeypatch.setattr(random, "random", lambda: 0.5)  # no jitter
+        target = TargetConfig(name="a", url="10.0.0.1")
+        poller = DevicePoller(Config(poll_interval_seconds=30, targets=[target]))
+        state = TargetState(target=target)
+
+        poller._schedule_next_poll(state, 0.0)
+        assert state.poll_interval == 30
+        assert state.next_poll_time == 30.0
+
+        poller._states["a"] = state
+        state.client = ShellyClient(base_url=target.url)
+        await poller.update_config(Config(poll_interval_seconds=5, targets=[target]))
+        poller._schedule_next_poll(state, 0.0)
+        assert state.poll_interval == 5
+        assert state.next_poll_time == 5.0
+        # The bound client is dropped so the next poll rebinds with new settings
+        assert state.client is None
+
+    async def test_poll_times_are_jittered(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test first polls spread over one interval and later polls vary by up to 5%."""
+        target = TargetConfig(name="a", url="10.0.0.1")
+        poller = DevicePoller(Config(poll_interval_seconds=100))
+        now = asyncio.get_running_loop().time()
+
+        monkeypatch.setattr(random, "random", lambda: 0.25)
+        state = poller._new_state(target)
+        assert now + 25 <= state.next_poll_time < now + 26
+
+        poller._schedule_next_poll(state, 0.0)
+        assert state.next_poll_time == pytest.approx(97.5)
+        monkeypatch.setattr(random, "random", lambda: 1.0)
+        poller._schedule_next_poll(state, 0.0)
+        assert state.next_poll_time == pytest.approx(105.0)
+
+    async def test_identical_config_reload_is_a_no_op(self) -> None:
+        """Test reloading an equal config keeps the current config and target states."""
+        config = Config(targets=[TargetConfig(name="a", url="10.0.0.1")])
+        poller = DevicePoller(config)
+        await poller.update_config(Config(targets=[TargetConfig(name="a", url="10.0.0.1")]))
+        state = poller._states["a"]
+        current = poller.config
+        epoch = poller._config_epoch
+
+        await poller.update_config(Config(targets=[TargetConfig(name="a", url="10.0.0.1")]))
+
+        assert poller.config is current
+        assert poller._states["a"] is state
+        assert poller._config_epoch == epoch
+
+
+class TestPollErrors:
+    """Tests for poll failure handling."""
+
+    async def test_unexpected_error_traceback_is_rate_limited(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test repeated unexpected failures log a traceback only on the first of every 10."""
+
+        class FailingClient:
+            async def get_device_info(self) -> dict[str, Any]:
+                return {"gen": 2, "app": "PlugUS", "model": "SNPL-00116US"}
+
+            async def get_status(self) -> dict[str, Any]:
+                raise RuntimeError("boom")
+
+        class StubPool:
+            def get_client(self, url: str, credentials: Any) -> FailingClient:
+                return FailingClient()
+
+        poller = DevicePoller(Config())
+        poller._admission = _AdmissionController(1)
+        poller._client_pool = StubPool()  # type: ignore[assignment]
+        state = TargetState(target=TargetConfig(name="flaky", url="10.0.0.1"))
+
+        for _ in range(11):
+            await poller._poll_target(state)
+
+        assert state.consecutive_failures == 11
+        tracebacks = [r for r in caplog.records if r.exc_info and "flaky" in r.getMessage()]
+        assert len(tracebacks) == 2
+
+    async def test_removed_target_in_flight_does_not_repopulate_metrics(self) -> None:
+        """Test a poll that finishes after its target was removed leaves no metrics behind."""
+        release = asyncio.Event()
+
+        class BlockedClient:
+            async def get_device_info(self) -> dict[str, Any]:
+                return {"gen": 2, "app": "PlugUS", "model": "SNPL-00116US"}
+
+            async def get_status(self) -> dict[str, Any]:
+                await release.wait()
+                raise RuntimeError("device went away")
+
+        class StubPool:
+            def get_client(self, url: str, credentials: Any) -> BlockedClient:
+                return BlockedClient()
+
+        target = TargetConfig(name="removed_mid_poll", url="10.0.0.1")
+        poller = DevicePoller(Config(targets=[target]))
+        poller._admission = _AdmissionController(1)
+        poller._client_pool = StubPool()  # type: ignore[assignment]
+        state = poller._states["removed_mid_poll"] = TargetState(target=target)
+
+        task = asyncio.create_task(poller._poll_target(state))
+        await asyncio.sleep(0.01)
+        assert await poller.remove_target("removed_mid_poll")
+        release.set()
+        await task
+
+        assert "removed_mid_poll" not in _device_cache_keys
+        assert not any(k[1] and k[1][0] == "removed_mid_poll" for k in _child_cache)
+
+    def test_backoff_table_matches_exponential_backoff(self) -> None:
+        """Test precomputed backoff delays grow by the multiplier up to the cap."""
+        poller = DevicePoller(
+            Config(backoff_base_seconds=30, backoff_multiplier=2, backoff_max_seconds=300)
+        )
+        assert poller._backoff_table == (30, 60, 120, 240, 300)
+
+        state = TargetState(target=TargetConfig(name="down", url="10.0.0.1"))
+        for failures, expected in ((1, 30), (4, 240), (5, 300), (20, 300)):
+            state.consecutive_failures = failures - 1
+            poller._handle_poll_error(state, "timeout", 0.1, 0.0)
+            assert state.backoff_until == expected
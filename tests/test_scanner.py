@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+import ipaddress
+import json
 import tempfile
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +21,7 @@ from shelly_exporter.config import (
     TargetConfig,
 )
 from shelly_exporter.drivers.registry import DriverRegistry
+from shelly_exporter.metrics import shelly_discovery_scan_errors
 from shelly_exporter.scanner import (
     DiscoveredDevice,
     NetworkScanner,
@@ -48,6 +52,13 @@ class TestParseNetworkRange:
         assert "10.0.80.1" in ips
         assert "10.0.80.2" in ips
 
+    def test_parse_cidr_matches_ipaddress(self) -> None:
+        """Test CIDR expansion matches the ipaddress module, including /31 and /32."""
+        for cidr in ("10.0.0.0/22", "10.0.0.0/31", "10.0.0.7/32"):
+            network = ipaddress.IPv4Network(cidr)
+            expected = network.hosts() if network.prefixlen <= 30 else network
+            assert parse_network_range(cidr) == [str(ip) for ip in expected]
+
     def test_parse_ip_range(self) -> None:
         """Test parsing IP range notation."""
         ips = parse_network_range("192.168.1.100-192.168.1.105")
@@ -113,6 +124,12 @@ class TestGenerateIpList:
         ips = generate_ip_list(ranges, [])
         assert len(ips) == 4  # 1, 2, 3, 4 - no duplicates
 
+    def test_generate_sorted_numerically(self) -> None:
+        """Test IPs are sorted by address and invalid exclusions are ignored."""
+        ranges = ["10.0.80.9-10.0.80.11", "9.255.255.255", "10.0.80.100"]
+        ips = generate_ip_list(ranges, ["10.0.80.10", "not-an-ip"])
+        assert ips == ["9.255.255.255", "10.0.80.9", "10.0.80.11", "10.0.80.100"]
+
 
 class TestFormatDeviceName:
     """Tests for format_device_name function."""
@@ -256,14 +273,16 @@ class TestNetworkScanner:
 
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "result": {
-                "model": "SPSW-104PE16EU",
-                "gen": 2,
-                "app": "Pro4PM",
-                "mac": "A8032AB12345",
+        mock_response.content = json.dumps(
+            {
+                "result": {
+                    "model": "SPSW-104PE16EU",
+                    "gen": 2,
+                    "app": "Pro4PM",
+                    "mac": "A8032AB12345",
+                }
             }
-        }
+        ).encode()
 
         mock_client = MagicMock()
         mock_client.post = AsyncMock(return_value=mock_response)
@@ -314,7 +333,7 @@ class TestNetworkScanner:
 
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"result": {"something": "else"}}
+        mock_response.content = json.dumps({"result": {"something": "else"}}).encode()
 
         mock_client = MagicMock()
         mock_client.post = AsyncMock(return_value=mock_response)
@@ -343,6 +362,128 @@ class TestNetworkScanner:
         # Original should be unchanged
         assert "10.0.80.99" not in scanner._discovered_devices
 
+    def test_configured_urls_normalized(self, mock_registry: DriverRegistry) -> None:
+        """Test configured target URLs are reduced to bare hosts for deduplication."""
+        config = Config(
+            targets=[
+                TargetConfig(name="a", url="http://10.0.80.1/"),
+                TargetConfig(name="b", url="https://10.0.80.2"),
+                TargetConfig(name="c", url="10.0.80.3"),
+            ]
+        )
+        scanner = NetworkScanner(config, mock_registry)
+        assert scanner._configured_urls == frozenset({"10.0.80.1", "10.0.80.2", "10.0.80.3"})
+        assert scanner._is_already_configured("10.0.80.2")
+        assert not scanner._is_already_configured("10.0.80.4")
+
+    async def test_scan_network_bounds_concurrency(self, mock_registry: DriverRegistry) -> None:
+        """Test a scan runs at most scan_concurrency probes and records found devices."""
+        config = Config(
+            discovery=DiscoveryConfig(
+                enabled=True,
+                network_ranges=["10.0.80.1-10.0.80.20"],
+                scan_concurrency=3,
+            ),
+        )
+        scanner = NetworkScanner(config, mock_registry)
+        active = 0
+        peak = 0
+
+        async def fake_probe(ip: str, client: Any, credentials: Any) -> DiscoveredDevice | None:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            if ip == "10.0.80.13":
+                raise RuntimeError("probe failed")
+            if ip in ("10.0.80.2", "10.0.80.17"):
+                return DiscoveredDevice(ip=ip, device_info={"model": "SNPL-00116US", "gen": 2})
+            return None
+
+        scanner._probe_ip = fake_probe  # type: ignore[method-assign]
+        scanner._tcp_alive = AsyncMock(return_value=True)  # type: ignore[method-assign]
+        new_devices = await scanner._scan_network()
+
+        assert peak == 3
+        assert sorted(d.ip for d in new_devices) == ["10.0.80.17", "10.0.80.2"]
+        assert set(scanner.discovered_devices) == {"10.0.80.2", "10.0.80.17"}
+
+    async def test_scan_continues_after_tcp_check_error(
+        self, mock_config: Config, mock_registry: DriverRegistry
+    ) -> None:
+        """Test an unexpected TCP pre-check error skips that address and is counted."""
+
+        async def fake_tcp_alive(ip: str) -> bool:
+            if ip == "10.0.80.1":
+                raise ValueError("bad address")
+            return True
+
+        scanner = NetworkScanner(mock_config, mock_registry)
+        scanner._tcp_alive = fake_tcp_alive  # type: ignore[method-assign]
+        scanner._probe_ip = AsyncMock(return_value=None)  # type: ignore[method-assign]
+        errors_before = shelly_discovery_scan_errors._value.get()
+
+        await scanner._scan_network()
+
+        probed = {call.args[0] for call in scanner._probe_ip.await_args_list}
+        assert "10.0.80.1" not in probed
+        assert "10.0.80.2" in probed
+        assert shelly_discovery_scan_errors._value.get() == errors_before + 1
+
+    async def test_tcp_precheck_skips_dead_hosts(
+        self, mock_config: Config, mock_registry: DriverRegistry, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test only hosts accepting a TCP connection get an HTTP probe."""
+
+        async def fake_open_connection(host: str, port: int) -> tuple[Any, Any]:
+            if host != "10.0.80.2":
+                raise ConnectionRefusedError
+            return MagicMock(), MagicMock(wait_closed=AsyncMock())
+
+        monkeypatch.setattr(asyncio, "open_connection", fake_open_connection)
+        scanner = NetworkScanner(mock_config, mock_registry)
+        scanner._probe_ip = AsyncMock(return_value=None)  # type: ignore[method-assign]
+
+        await scanner._scan_network()
+        scanner._probe_ip.assert_awaited_once()
+        assert scanner._probe_ip.await_args.args[0] == "10.0.80.2"
+
+        # A zero timeout disables the check
+        scanner.discovery_config.tcp_probe_timeout = 0
+        assert await scanner._tcp_alive("10.0.80.1")
+
+    async def test_scans_share_http_client_while_running(
+        self, mock_config: Config, mock_registry: DriverRegistry
+    ) -> None:
+        """Test the running service reuses one HTTP client and closes it on stop."""
+        scanner = NetworkScanner(mock_config, mock_registry)
+        clients: list[Any] = []
+
+        async def fake_probe(ip: str, client: Any, auth: Any) -> None:
+            clients.append(client)
+
+        scanner._probe_ip = fake_probe  # type: ignore[method-assign]
+        scanner._tcp_alive = AsyncMock(return_value=True)  # type: ignore[method-assign]
+        scanner._scan_loop = AsyncMock()  # type: ignore[method-assign]
+
+        await scanner.start()
+        shared = scanner._http_client
+        await scanner._scan_network()
+        await scanner._scan_network()
+        assert shared is not None
+        assert all(client is shared for client in clients)
+
+        await scanner.stop()
+        assert scanner._http_client is None
+        assert shared.is_closed
+
+        # A one-off scan outside the service uses and closes its own client
+        clients.clear()
+        await scanner._scan_network()
+        assert clients[0] is not shared
+        assert clients[0].is_closed
+
 
 class TestPersistence:
     """Tests for discovered devices persistence."""
@@ -444,6 +585,36 @@ class TestPersistence:
             assert loaded[0].credentials.username == "admin"
             assert loaded[0].credentials.password == "secret"
 
+    def test_save_and_load_json(self) -> None:
+        """Test that a .json persist path is written and read back as JSON."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            persist_path = Path(tmpdir) / "discovered.json"
+
+            targets = [
+                TargetConfig(
+                    name="device",
+                    url="10.0.80.1",
+                    discovered=True,
+                    credentials=Credentials(username="admin", password="secret"),
+                    channels=[ChannelConfig(type="switch", index=0)],
+                ),
+            ]
+
+            save_discovered_devices(persist_path, targets)
+            data = json.loads(persist_path.read_text())
+            assert data["discovered_targets"][0]["name"] == "device"
+
+            loaded = load_discovered_devices(persist_path)
+            assert len(loaded) == 1
+            assert loaded[0].url == "10.0.80.1"
+            assert loaded[0].channels[0].type == "switch"
+            assert loaded[0].credentials is not None
+            assert loaded[0].credentials.password == "secret"
+
+            # An empty JSON file loads as no devices
+            persist_path.write_text("")
+            assert load_discovered_devices(persist_path) == []
+
     def test_load_empty_file(self) -> None:
         """Test loading from empty/invalid file returns empty list."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,99 @@
+"""Tests for the Shelly RPC client."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from shelly_exporter import shelly_client
+from shelly_exporter.config import Credentials
+from shelly_exporter.shelly_client import ShellyClient, ShellyClientError, basic_auth
+
+
+def _client(body: bytes) -> ShellyClient:
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    return ShellyClient(base_url="10.0.0.1", client=httpx.AsyncClient(transport=transport))
+
+
+class TestRpcCall:
+    """Tests for decoding RPC responses."""
+
+    async def test_returns_result(self) -> None:
+        """Test the result field is decoded from the raw response body."""
+        client = _client(b'{"id": 1, "result": {"switch:0": {"output": true, "apower": 12.5}}}')
+        assert await client.get_status() == {"switch:0": {"output": True, "apower": 12.5}}
+
+    async def test_sends_json_request(self) -> None:
+        """Test the RPC request is sent as a JSON body with a JSON content type."""
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, content=b'{"id": 1, "result": {}}')
+
+        client = ShellyClient(
+            base_url="10.0.0.1",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        await client.get_device_info()
+
+        assert requests[0].headers["content-type"] == "application/json"
+        assert json.loads(requests[0].content) == {"id": 1, "method": "Shelly.GetDeviceInfo"}
+
+    async def test_rpc_error_raises(self) -> None:
+        """Test an RPC error object raises ShellyClientError."""
+        client = _client(b'{"id": 1, "error": {"code": 404, "message": "No handler"}}')
+        with pytest.raises(ShellyClientError, match="RPC error 404"):
+            await client.get_device_info()
+
+    @pytest.mark.parametrize("body", [b"[]", b"null", b'{"id": 1, "result": 5}'])
+    async def test_non_object_response_raises(self, body: bytes) -> None:
+        """Test a response or result that is not a JSON object raises ShellyClientError."""
+        client = _client(body)
+        with pytest.raises(ShellyClientError, match="Unexpected RPC"):
+            await client.get_status()
+
+
+class TestBasicAuth:
+    """Tests for building HTTP auth from credentials."""
+
+    def test_no_credentials(self) -> None:
+        """Test empty or missing credentials produce no auth."""
+        assert basic_auth(None) is None
+        assert basic_auth(Credentials()) is None
+
+    async def test_client_sends_auth(self) -> None:
+        """Test the auth built once in the client is sent with each request."""
+        headers: list[str | None] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            headers.append(request.headers.get("authorization"))
+            return httpx.Response(200, content=b'{"id": 1, "result": {}}')
+
+        client = ShellyClient(
+            base_url="10.0.0.1",
+            credentials=Credentials(username="admin", password="secret"),
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        await client.get_status()
+        await client.get_status()
+
+        assert headers == ["Basic YWRtaW46c2VjcmV0"] * 2
+
+
+class TestJsonHelpers:
+    """Tests for the JSON encode/decode helpers."""
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_round_trip(self, has_orjson: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test both backends encode compact JSON that decodes back to the same value."""
+        if has_orjson:
+            pytest.importorskip("orjson")
+        monkeypatch.setattr(shelly_client, "_HAS_ORJSON", has_orjson)
+
+        payload = {"id": 1, "method": "Shelly.GetStatus"}
+        encoded = shelly_client.encode_json(payload)
+        assert encoded == b'{"id":1,"method":"Shelly.GetStatus"}'
+        assert shelly_client.decode_json(encoded) == payload
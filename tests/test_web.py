@@ -0,0 +1,115 @@
+"""Tests for the metrics HTTP endpoint."""
+
+from __future__ import annotations
+
+import gzip
+from collections.abc import Iterator
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from prometheus_client import REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+
+from shelly_exporter import web
+from shelly_exporter.metrics import update_poll_skipped
+
+
+class TestMetricsHandler:
+    """Tests for /metrics rendering."""
+
+    async def test_output_reused_until_metrics_change(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test scrapes reuse the rendered output until an exporter metric is updated."""
+        renders: list[int] = []
+
+        def fake_generate_latest() -> bytes:
+            renders.append(1)
+            return f"render {len(renders)}\n".encode()
+
+        monkeypatch.setattr(web, "generate_latest", fake_generate_latest)
+        monkeypatch.setattr(web, "_metrics_cache", None)
+        monkeypatch.setattr(web, "_monotonic", lambda: 100.0)
+
+        async with TestClient(TestServer(web.create_app())) as client:
+            first = await (await client.get("/metrics")).text()
+            second = await (await client.get("/metrics")).text()
+            assert first == second == "render 1\n"
+
+            update_poll_skipped("web_test", 1)
+            response = await client.get("/metrics")
+            assert await response.text() == "render 2\n"
+            assert response.content_type == "text/plain"
+
+        assert len(renders) == 2
+
+    async def test_gzip_negotiated(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test clients accepting gzip get a compressed body and others get plain text."""
+        monkeypatch.setattr(web, "generate_latest", lambda: b"shelly_up 1.0\n" * 100)
+        monkeypatch.setattr(web, "_metrics_cache", None)
+
+        async with TestClient(TestServer(web.create_app())) as client:
+            response = await client.get("/metrics", headers={"Accept-Encoding": "gzip"})
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert await response.text() == "shelly_up 1.0\n" * 100
+
+            response = await client.get("/metrics", headers={"Accept-Encoding": "identity"})
+            assert "Content-Encoding" not in response.headers
+            assert await response.text() == "shelly_up 1.0\n" * 100
+
+        assert web._metrics_cache is not None
+        assert gzip.decompress(web._metrics_cache[3]) == b"shelly_up 1.0\n" * 100
+
+    async def test_default_collectors_refresh_after_ttl(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a collector outside the exporter's metrics is re-rendered once the TTL passes."""
+
+        class ChangingCollector:
+            def __init__(self) -> None:
+                self.value = 0.0
+
+            def describe(self) -> list[GaugeMetricFamily]:
+                return []
+
+            def collect(self) -> Iterator[GaugeMetricFamily]:
+                self.value += 1
+                yield GaugeMetricFamily("web_test_changing", "Changes on every collect", self.value)
+
+        clock = [100.0]
+        monkeypatch.setattr(web, "_monotonic", lambda: clock[0])
+        monkeypatch.setattr(web, "_metrics_cache", None)
+        collector = ChangingCollector()
+        REGISTRY.register(collector)
+        try:
+            async with TestClient(TestServer(web.create_app())) as client:
+                assert "web_test_changing 1.0" in await (await client.get("/metrics")).text()
+                assert "web_test_changing 1.0" in await (await client.get("/metrics")).text()
+
+                clock[0] += web._METRICS_CACHE_TTL
+                assert "web_test_changing 2.0" in await (await client.get("/metrics")).text()
+        finally:
+            REGISTRY.unregister(collector)
+
+
+class TestAcceptsGzip:
+    """Tests for Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("gzip", True),
+            ("deflate, gzip;q=1.0, *;q=0.5", True),
+            ("GZIP; q=0.3", True),
+            ("gzip;q=0", False),
+            ("gzip;q=0.0, *", False),
+            ("x-gzip", False),
+            ("identity", False),
+            ("*", True),
+            ("*;q=0", False),
+            ("", False),
+        ],
+    )
+    def test_header_parsing(self, header: str, expected: bool) -> None:
+        """Test gzip is chosen only when the header accepts it with a non-zero q-value."""
+        assert web._accepts_gzip(header) is expected